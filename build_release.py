@@ -7,38 +7,105 @@ distribution.
 """
 
 import argparse
+import hashlib
+import os
 import tomllib
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 
-from rendered.services.htmpl_admin.graph import build_component_ttl
+from rendered.services.htmpl_admin.graph import write_component_ttl
 
 
-def find_project_root() -> Path:
-    """Find the project root by looking for pyproject.toml."""
-    current = Path(__file__).resolve().parent
-    while current != current.parent:
-        if (current / "pyproject.toml").exists():
-            return current
-        current = current.parent
+@lru_cache(maxsize=8)
+def _find_root(start: str) -> Path:
+    current = start
+    while current != os.path.dirname(current):
+        if os.path.isfile(os.path.join(current, "pyproject.toml")):
+            return Path(current)
+        current = os.path.dirname(current)
     raise RuntimeError("Could not find project root")
 
 
-def build_ttl(rendered_dir: Path, output_path: Path) -> None:
-    """Generate TTL from rendered/ and write to output."""
-    ttl_content = build_component_ttl(rendered_dir)
+def find_project_root() -> Path:
+    """Find the project root by looking for pyproject.toml."""
+    return _find_root(os.path.dirname(os.path.realpath(__file__)))
+
+
+# First line of a generated TTL file, a turtle comment so parsers skip it
+TTL_KEY_PREFIX = "# source-key: "
+
+
+def scan_tree(root: Path) -> Iterator[os.DirEntry[str]]:
+    """Yield every entry under root without following symlinked directories."""
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                yield entry
+
+
+def ttl_source_key(template_dir: Path) -> str:
+    """Hash path, mtime and size of every file write_component_ttl reads.
+
+    That is graph.py itself plus each component's component.toml and the
+    README it names. Symlinked component directories are followed.
+    """
+    files = [Path(write_component_ttl.__code__.co_filename)]
+    for base in ("components", "services"):
+        try:
+            with os.scandir(template_dir / "app" / base) as it:
+                component_dirs = [Path(e.path) for e in it if e.is_dir()]
+        except FileNotFoundError:
+            continue
+        for component_dir in component_dirs:
+            toml_path = component_dir / "component.toml"
+            try:
+                with open(toml_path, "rb") as f:
+                    readme = tomllib.load(f)["project"].get("readme")
+            except FileNotFoundError:
+                continue
+            files.append(toml_path)
+            if readme:
+                files.append(component_dir / readme)
+
+    digest = hashlib.sha256()
+    for path in sorted(files):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            # A named README that is missing is skipped by the builder
+            digest.update(f"{path}\0missing\n".encode())
+            continue
+        digest.update(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def build_ttl(template_dir: Path, output_path: Path, force: bool = False) -> None:
+    """Generate TTL from template_dir and write to output, unless it is current."""
+    header = f"{TTL_KEY_PREFIX}{ttl_source_key(template_dir)}\n"
+    if not force and output_path.exists():
+        with open(output_path) as f:
+            if f.readline() == header:
+                print(f"Up to date {output_path}")
+                return
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(ttl_content)
+    with open(output_path, "w") as f:
+        f.write(header)
+        write_component_ttl(template_dir, f)
     print(f"Generated {output_path}")
 
 
 def validate_symlinks(rendered_dir: Path) -> list[str]:
     """Check that all symlinks in rendered/ are valid."""
     errors = []
-    for path in rendered_dir.rglob("*"):
-        if path.is_symlink():
-            target = path.resolve()
-            if not target.exists():
-                errors.append(f"Broken symlink: {path} -> {path.readlink()}")
+    for entry in scan_tree(rendered_dir):
+        # stat() follows the whole link chain in one syscall, no resolve() needed
+        if entry.is_symlink() and not os.path.exists(entry.path):
+            errors.append(f"Broken symlink: {entry.path} -> {os.readlink(entry.path)}")
     return errors
 
 
@@ -61,6 +128,11 @@ def main():
         action="store_true",
         help="Only validate symlinks, don't generate files",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate files even if their sources are unchanged",
+    )
     parser.add_argument(
         "--ttl-output",
         type=Path,
@@ -94,7 +166,7 @@ def main():
         args.ttl_output
         or template_dir / "app" / "services" / "htmpl_admin" / "components.ttl"
     )
-    build_ttl(template_dir, ttl_output)
+    build_ttl(template_dir, ttl_output, force=args.force)
 
     print("\nBuild complete!")
     print(f"  TTL: {ttl_output}")
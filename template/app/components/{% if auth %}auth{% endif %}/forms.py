@@ -3,7 +3,7 @@ import re
 from htmpl.forms import BaseForm
 from pydantic import EmailStr, Field, SecretStr, field_validator
 
-VALIDUSERNAME = re.compile(r"^[a-z0-9_-]$")
+VALIDUSERNAME = re.compile(r"[a-z0-9_-]+")
 
 
 class LoginForm(BaseForm):
@@ -25,7 +25,7 @@ class RegistrationForm(BaseForm):
     @classmethod
     def username_valid(cls, username: str) -> str:
         _username = username.lower()
-        if VALIDUSERNAME.match(_username):
+        if VALIDUSERNAME.fullmatch(_username):
             return _username
 
         raise ValueError(
@@ -7,7 +7,8 @@ def login_form(form: LoginForm, values: dict | None = None) -> Template:
     return t'''<!DOCTYPE html>
 <html data-theme="dark">
 <head><title>Login</title>
-  <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@picocss/pico@2/css/pico.min.css">
+  <link rel="preconnect" href="https://cdn.jsdelivr.net">
+  <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@picocss/pico@2.1.1/css/pico.min.css">
 </head>
 <body class="container">
 <article style="max-width: 600px; margin: 4rem auto;">
@@ -2,11 +2,18 @@
 
 import base64
 import gzip
+import io
+import os
 import re
 import tomllib
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import IO
 from pydantic import BaseModel
-from rdflib import Graph, Namespace, Literal
+from rdflib import Graph, Namespace, Literal, URIRef
 from structlog.stdlib import get_logger
 
 logger = get_logger("html_admin")
@@ -14,10 +21,20 @@ logger = get_logger("html_admin")
 HTMPL = Namespace("htmpl://")
 DEP = Namespace("htmpl://depends/")
 STATUS = Namespace("htmpl://status/")
+_HTMPL_PREFIX = str(HTMPL)
 
 # Match jinja conditionals like {% if auth %}auth{% endif %}
 JINJA_CONDITIONAL_RE = re.compile(r"\{%\s*if\s+(\w+)\s*%\}.*?\{%\s*endif\s*%\}")
 
+# Match the line shapes written by build_component_ttl
+TTL_PREFIX_RE = re.compile(r"@prefix\s+(\w*):\s+<([^>]*)>\s*\.")
+TTL_TRIPLE_RE = re.compile(
+    r'<([^>]*)>\s+(\w*):(\w+)\s+(?:<([^>]*)>|"((?:[^"\\]|\\.)*)")\s*\.'
+)
+TTL_ESCAPE_RE = re.compile(r"\\(.)")
+# Escapes decoded here, literals with any other (\u, \b, ...) go to rdflib
+TTL_ESCAPES = {"\\": "\\", '"': '"', "n": "\n", "r": "\r", "t": "\t"}
+
 CURRENT_DIR = Path(__file__).parent
 
 
@@ -52,6 +69,9 @@ def extract_config_key(dirname: str) -> str | None:
         "{% if use_redis %}redis{% endif %}" -> "use_redis"
         "htmpl_admin" -> None (no conditional, always included)
     """
+    # Plain directory names are the common case, skip the regex for them
+    if "{%" not in dirname:
+        return None
     match = JINJA_CONDITIONAL_RE.search(dirname)
     return match.group(1) if match else None
 
@@ -62,85 +82,172 @@ def _decode_readme(encoded: str) -> str:
     return gzip.decompress(compressed).decode("utf-8")
 
 
-def build_component_ttl(template_dir: Path) -> str:
-    """Build TTL from component.toml files in the template directory.
+def _component_dirs(base_dir: Path) -> list[os.DirEntry[str]]:
+    """List the component directories directly under base_dir."""
+    try:
+        with os.scandir(base_dir) as it:
+            return [entry for entry in it if entry.is_dir()]
+    except FileNotFoundError:
+        return []
+
+
+# Keyed on stat so an edited README is re-read, unchanged ones are reused
+@lru_cache(maxsize=512)
+def _encode_readme(path: str, mtime_ns: int, size: int) -> str:
+    """Gzip and base64 encode a README for the htmpl:readme literal."""
+    with open(path, "rb") as f:
+        return base64.b64encode(gzip.compress(f.read())).decode("ascii")
+
+
+def _load_component(component_dir: str, config_key: str | None) -> dict | None:
+    """Read a component directory into a record used to emit TTL."""
+    try:
+        with open(os.path.join(component_dir, "component.toml"), "rb") as f:
+            config = tomllib.load(f)["project"]
+    except FileNotFoundError:
+        return None
+
+    readme = None
+    if readme_path := config.get("readme"):
+        readme_file = os.path.join(component_dir, readme_path)
+        try:
+            stat = os.stat(readme_file)
+            readme = _encode_readme(readme_file, stat.st_mtime_ns, stat.st_size)
+        except (FileNotFoundError, IsADirectoryError):
+            pass
+
+    return {
+        "uri": config["uri"],
+        "name": config["name"],
+        "config_key": config_key,
+        "dependencies": config.get("dependencies", []),
+        "help": config.get("help"),
+        "readme": readme,
+    }
+
+
+def _escape_literal(value: str) -> str:
+    """Escape a value for use inside a double quoted TTL string."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _component_ttl(record: dict) -> list[str]:
+    """Render the triple lines for one component record."""
+    # Use full URI syntax since URIs contain slashes
+    subject = f"<htmpl://{record['uri']}>"
+
+    # Add name mapping
+    parts = [f'{subject} htmpl:name "{_escape_literal(record["name"])}" .']
+
+    # Add config key if this is a conditional component
+    if config_key := record["config_key"]:
+        parts.append(f'{subject} htmpl:configKey "{config_key}" .')
+
+    # Add dependencies
+    for d in record["dependencies"]:
+        ns, value = parse_dependency(d)
+        if ns == "python":
+            # Python deps are literals for external package managers
+            parts.append(f'{subject} dep:python "{_escape_literal(value)}" .')
+        else:
+            # Internal htmpl deps are graph nodes
+            parts.append(f"{subject} dep:requires <{ns}://{value}> .")
 
-    Expects structure like:
-        template/{{name}}/{{module}}/components/{% if auth %}auth{% endif %}/
-        template/{{name}}/{{module}}/services/htmpl_admin/
-    """
-    lines = [
-        "@prefix htmpl: <htmpl://> .",
-        "@prefix dep: <htmpl://depends/> .",
-        "",
-    ]
-
-    # Find the module directory (handles {{name}}/{{module}} pattern)
-    module_dirs = list(template_dir.glob("app/"))
-    if not module_dirs:
-        return "\n".join(lines)
-
-    module_dir = module_dirs[0]
-
-    def process_component_dir(base_dir: Path, component_type: str):
-        """Process components or services directory."""
-        if not base_dir.exists():
-            return
-
-        for component_dir in base_dir.iterdir():
-            if not component_dir.is_dir():
-                continue
+    # Add help text
+    if help_text := record["help"]:
+        parts.append(f'{subject} htmpl:help "{_escape_literal(help_text)}" .')
 
-            toml_path = component_dir / "component.toml"
-            if not toml_path.exists():
-                continue
+    if encoded := record["readme"]:
+        parts.append(f'{subject} htmpl:readme "{encoded}" .')
 
-            config = tomllib.loads(toml_path.read_text())["project"]
-            uri = config["uri"]
-            name = config["name"]
+    parts.append("")  # Blank line between components
+    return parts
 
-            # Extract config key from directory name
-            config_key = extract_config_key(component_dir.name)
 
-            # Use full URI syntax since URIs contain slashes
-            subject = f"<htmpl://{uri}>"
+def write_component_ttl(
+    template_dir: Path, out: IO[str], module_dir: Path | None = None
+) -> None:
+    """Write TTL for the components in template_dir to out.
+
+    Expects structure like:
+        template/app/components/{% if auth %}auth{% endif %}/
+        template/app/services/htmpl_admin/
+
+    Pass module_dir to read components from a directory other than
+    template_dir/app.
+    """
+    out.write(
+        "@prefix htmpl: <htmpl://> .\n"
+        "@prefix dep: <htmpl://depends/> .\n"
+    )
+
+    # Missing components/ or services/ directories simply yield no entries
+    module_dir = module_dir or template_dir / "app"
+
+    paths: list[str] = []
+    config_keys: list[str | None] = []
+    for base_dir in (module_dir / "components", module_dir / "services"):
+        for entry in _component_dirs(base_dir):
+            paths.append(entry.path)
+            # Extract config key from directory name
+            config_keys.append(extract_config_key(entry.name))
 
-            # Add name mapping
-            lines.append(f'{subject} htmpl:name "{name}" .')
+    # Reading and parsing is I/O bound, emitting stays sequential and sorted
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        records = [r for r in executor.map(_load_component, paths, config_keys) if r]
 
-            # Add config key if this is a conditional component
-            if config_key:
-                lines.append(f'{subject} htmpl:configKey "{config_key}" .')
+    # Written per component so the whole document is never held at once
+    for record in sorted(records, key=lambda r: r["uri"]):
+        out.write("\n")
+        out.write("\n".join(_component_ttl(record)))
 
-            # Add dependencies
-            for d in config.get("dependencies", []):
-                ns, value = parse_dependency(d)
-                if ns == "python":
-                    # Python deps are literals for external package managers
-                    lines.append(f'{subject} dep:python "{value}" .')
-                else:
-                    # Internal htmpl deps are graph nodes
-                    lines.append(f"{subject} dep:requires <{ns}://{value}> .")
 
-            # Add help text
-            if help_text := config.get("help"):
-                escaped = help_text.replace('"', '\\"')
-                lines.append(f'{subject} htmpl:help "{escaped}" .')
+def build_component_ttl(template_dir: Path, module_dir: Path | None = None) -> str:
+    """Build TTL from component.toml files in the template directory.
 
-            if readme_path := config.get("readme"):
-                readme_file = component_dir / readme_path
-                if readme_file.exists():
-                    content = readme_file.read_bytes()
-                    compressed = gzip.compress(content)
-                    encoded = base64.b64encode(compressed).decode("ascii")
-                    lines.append(f'{subject} htmpl:readme "{encoded}" .')
+    See write_component_ttl, this returns the document as a string.
+    """
+    out = io.StringIO()
+    write_component_ttl(template_dir, out, module_dir)
+    return out.getvalue()
 
-            lines.append("")  # Blank line between components
 
-    process_component_dir(module_dir / "components", "component")
-    process_component_dir(module_dir / "services", "service")
+def parse_component_ttl(text: str) -> list[tuple[URIRef, URIRef, URIRef | Literal]] | None:
+    """Parse TTL written by build_component_ttl without the rdflib parser.
 
-    return "\n".join(lines)
+    Returns None if the text contains anything outside of the simple
+    one-triple-per-line shape, callers should fall back to rdflib then.
+    """
+    prefixes: dict[str, str] = {}
+    triples: list[tuple[URIRef, URIRef, URIRef | Literal]] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if match := TTL_TRIPLE_RE.fullmatch(line):
+            subject, prefix, local, uri, literal = match.groups()
+            if prefix not in prefixes:
+                return None
+            if uri is not None:
+                obj = URIRef(uri)
+            elif "\\" not in literal:
+                obj = Literal(literal)
+            elif TTL_ESCAPES.keys() >= set(TTL_ESCAPE_RE.findall(literal)):
+                obj = Literal(TTL_ESCAPE_RE.sub(lambda m: TTL_ESCAPES[m[1]], literal))
+            else:
+                return None
+            triples.append((URIRef(subject), URIRef(prefixes[prefix] + local), obj))
+        elif match := TTL_PREFIX_RE.fullmatch(line):
+            prefixes[match[1]] = match[2]
+        else:
+            return None
+    return triples
 
 
 class ComponentGraph:
@@ -149,11 +256,25 @@ class ComponentGraph:
         components_ttl: Path = CURRENT_DIR / "components.ttl",
         project_dir: Path | None = None,
     ):
-        self.graph = Graph()
-        self.graph.bind("htmpl", HTMPL)
-        self.graph.bind("dep", DEP)
-        self.graph.bind("status", STATUS)
         self.project_dir = project_dir or Path(".")
+        self._triples: list[tuple[URIRef, URIRef, URIRef | Literal]] = []
+        self._rdf: Graph | None = None
+        self._adj: dict[str, set[str]] = {}
+        self._radj: dict[str, set[str]] = {}
+        self._nodes: set[str] = set()
+        self._python: dict[str, set[str]] = {}
+        self._name: dict[str, str] = {}
+        self._help: dict[str, str] = {}
+        self._config_key: dict[str, str] = {}
+        self._readme: dict[str, str] = {}
+        self._readme_text: dict[str, str] = {}
+        self._installed: frozenset[str] = frozenset()
+        # Transitive closures, the graph is static after load
+        self._deps: dict[str, frozenset[str]] = {}
+        self._dependents: dict[str, frozenset[str]] = {}
+        self._python_deps: dict[str, frozenset[str]] = {}
+        self._installed_stamp: tuple | None = None
+        self._components_cache: list[dict] | None = None
 
         # Load TTL from explicit path or discover from project
         if not components_ttl.exists():
@@ -164,83 +285,150 @@ class ComponentGraph:
             ttl_path = self._find_ttl()
 
         if ttl_path and ttl_path.exists():
-            self.graph.parse(ttl_path, format="turtle")
+            self._load_ttl(ttl_path)
             self._scan_installed()
 
+    def _load_ttl(self, ttl_path: Path):
+        """Load triples and index them into plain dicts for lookups."""
+        triples = parse_component_ttl(ttl_path.read_text())
+        if triples is None:
+            # Hand edited file, let rdflib handle the full turtle grammar
+            triples = list(Graph().parse(ttl_path, format="turtle"))
+        self._triples = triples
+
+        literals = {
+            HTMPL.name: self._name,
+            HTMPL.help: self._help,
+            HTMPL.configKey: self._config_key,
+            HTMPL.readme: self._readme,
+        }
+        for s, p, o in triples:
+            source, target = str(s), str(o)
+            is_htmpl = source.startswith(_HTMPL_PREFIX)
+            source = source.removeprefix(_HTMPL_PREFIX)
+            if p == DEP.requires:
+                # Every htmpl node on either end of an edge is a component
+                if is_htmpl:
+                    self._nodes.add(source)
+                if not target.startswith(_HTMPL_PREFIX):
+                    continue
+                target = target.removeprefix(_HTMPL_PREFIX)
+                self._nodes.add(target)
+                self._adj.setdefault(source, set()).add(target)
+                self._radj.setdefault(target, set()).add(source)
+            elif p == DEP.python:
+                self._python.setdefault(source, set()).add(target)
+            elif (index := literals.get(p)) is not None:
+                index[source] = target
+
+        self._deps = {n: frozenset(self._walk(self._adj, n)) for n in self._adj}
+        self._dependents = {n: frozenset(self._walk(self._radj, n)) for n in self._radj}
+        for n in self._adj.keys() | self._python.keys():
+            deps = set(self._python.get(n, ()))
+            for node in self._deps.get(n, ()):
+                deps |= self._python.get(node, set())
+            self._python_deps[n] = frozenset(deps)
+
+    @property
+    def graph(self) -> Graph:
+        """The loaded triples plus installed status as an rdflib Graph.
+
+        Lookups never touch this, it is built on first access for callers
+        that want to query or serialize the graph.
+        """
+        if self._rdf is None:
+            graph = Graph()
+            graph.bind("htmpl", HTMPL)
+            graph.bind("dep", DEP)
+            graph.bind("status", STATUS)
+            graph.addN((s, p, o, graph) for s, p, o in self._triples)
+            for uri in self._installed:
+                graph.add((HTMPL[uri], STATUS.installed, Literal(True)))
+            self._rdf = graph
+        return self._rdf
+
+    @staticmethod
+    def _walk(adjacency: dict[str, set[str]], uri: str) -> set[str]:
+        """Breadth-first walk returning every node reachable from uri."""
+        seen: set[str] = set()
+        queue = deque(adjacency.get(uri, ()))
+        while queue:
+            node = queue.popleft()
+            if node in seen:
+                continue
+            seen.add(node)
+            queue.extend(adjacency.get(node, ()))
+        return seen
+
     def _scan_installed(self):
         """Check filesystem for installed components."""
-        for uri in self._all_uris():
-            path = self.project_dir / uri
-            if path.exists():
-                self.graph.add((HTMPL[uri], STATUS.installed, Literal(True)))
+        self._components_cache = None
+        self._rdf = None
+        uris = self._all_uris()
+        self._installed_stamp = self._parent_stamp(uris)
+        # One listing per parent directory instead of a stat per component
+        by_parent: dict[str, set[str]] = {}
+        for uri in uris:
+            parent, _, name = uri.rpartition("/")
+            by_parent.setdefault(parent, set()).add(name)
+        installed: set[str] = set()
+        for parent, names in by_parent.items():
+            try:
+                present = names.intersection(os.listdir(self.project_dir / parent))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            prefix = f"{parent}/" if parent else ""
+            installed.update(prefix + name for name in present)
+        # Frozen, the graph and this set are shared by every request
+        self._installed = frozenset(installed)
+
+    def _parent_stamp(self, uris: set[str]) -> tuple:
+        """Mtimes of the directories holding components, None if missing.
+
+        Installing or removing a component adds or drops an entry in one of
+        these, which bumps its mtime.
+        """
+        stamp = []
+        for parent in sorted({uri.rpartition("/")[0] for uri in uris}):
+            try:
+                stamp.append((self.project_dir / parent).stat().st_mtime_ns)
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def refresh_installed(self):
+        """Re-check installed status, e.g. when reusing a loaded graph."""
+        if self._parent_stamp(self._all_uris()) != self._installed_stamp:
+            self._scan_installed()
 
     def _all_uris(self) -> set[str]:
         """Get all htmpl:// URIs (excluding python:// etc)."""
-        results = self.graph.query(
-            """
-            SELECT DISTINCT ?uri WHERE {
-                { ?uri dep:requires ?_ } UNION { ?_ dep:requires ?uri }
-                FILTER(STRSTARTS(STR(?uri), "htmpl://"))
-            }
-            """
-        )
-        return {str(row[0]).replace(str(HTMPL), "") for row in results}
+        return self._nodes
 
     def get_deps(self, uri: str) -> set[str]:
         """Get all transitive htmpl dependencies for a URI."""
-        results = self.graph.query(
-            """
-            SELECT ?dep WHERE {
-                ?uri dep:requires+ ?dep .
-                FILTER(STRSTARTS(STR(?dep), "htmpl://"))
-            }
-            """,
-            initBindings={"uri": HTMPL[uri]},
-        )
-        return {str(row[0]).replace(str(HTMPL), "") for row in results}
+        return set(self._deps.get(uri, ()))
+
+    def get_dependents(self, uri: str) -> set[str]:
+        """Get all URIs that transitively depend on a URI."""
+        return set(self._dependents.get(uri, ()))
 
     def get_python_deps(self, uri: str) -> set[str]:
         """Get Python package dependencies for a URI and its transitive deps."""
-        # Get direct python deps
-        direct = self.graph.query(
-            """
-            SELECT ?dep WHERE {
-                ?uri dep:python ?dep .
-            }
-            """,
-            initBindings={"uri": HTMPL[uri]},
-        )
-        result = {str(row[0]) for row in direct}
-
-        # Get python deps from transitive htmpl deps
-        transitive = self.graph.query(
-            """
-            SELECT ?dep WHERE {
-                ?uri dep:requires+ ?intermediate .
-                ?intermediate dep:python ?dep .
-            }
-            """,
-            initBindings={"uri": HTMPL[uri]},
-        )
-        result |= {str(row[0]) for row in transitive}
-
-        return result
-
-    def get_installed(self) -> set[str]:
-        results = self.graph.query(
-            """
-            SELECT ?uri WHERE {
-                ?uri status:installed true .
-            }
-            """
-        )
-        return {str(row[0]).replace(str(HTMPL), "") for row in results}
+        return set(self._python_deps.get(uri, ()))
+
+    def get_python_deps_bulk(self, uris: Iterable[str]) -> set[str]:
+        """Get Python package dependencies for several URIs in one union."""
+        return set().union(*(self._python_deps.get(uri, ()) for uri in uris))
+
+    def get_installed(self) -> frozenset[str]:
+        return self._installed
 
     def resolve(self, selected: list[str]) -> set[str]:
         """Return all URIs needed, excluding already installed."""
         needed = set(selected)
         for uri in selected:
-            needed |= self.get_deps(uri)
+            needed |= self._deps.get(uri, frozenset())
         return needed - self.get_installed()
 
     def get_config_keys(self, uris: list[str]) -> dict[str, str]:
@@ -248,87 +436,52 @@ class ComponentGraph:
 
         Returns dict mapping config_key -> uri for components that have config keys.
         """
-        results = self.graph.query(
-            """
-            SELECT ?uri ?key WHERE {
-                ?uri htmpl:configKey ?key .
-            }
-            """
-        )
-        uri_to_key = {
-            str(row[0]).replace(str(HTMPL), ""): str(row[1]) for row in results
-        }
-        return {uri_to_key[uri]: uri for uri in uris if uri in uri_to_key}
+        return {self._config_key[uri]: uri for uri in uris if uri in self._config_key}
 
     def all_components(self) -> list[dict]:
-        """Return metadata for all htmpl components."""
+        """Return metadata for all htmpl components.
+
+        The list is cached and shared by every caller until installed status
+        changes, treat it and its dicts as read-only.
+        """
+        if self._components_cache is not None:
+            return self._components_cache
         installed = self.get_installed()
-        results = self.graph.query(
-            """
-            SELECT DISTINCT ?uri ?name ?help ?configKey WHERE {
-                { ?uri dep:requires ?_ } UNION { ?_ dep:requires ?uri }
-                FILTER(STRSTARTS(STR(?uri), "htmpl://"))
-                OPTIONAL { ?uri htmpl:name ?name }
-                OPTIONAL { ?uri htmpl:help ?help }
-                OPTIONAL { ?uri htmpl:configKey ?configKey }
-            }
-            """
-        )
-        return [
+        self._components_cache = [
             {
-                "uri": (uri := str(row[0]).replace(str(HTMPL), "")),
-                "name": str(row[1]) if row[1] else uri.split("/")[-1],
-                "help": str(row[2]) if row[2] else "",
-                "config_key": str(row[3]) if row[3] else None,
+                "uri": uri,
+                "name": self._name.get(uri) or uri.split("/")[-1],
+                "help": self._help.get(uri, ""),
+                "config_key": self._config_key.get(uri),
                 "installed": uri in installed,
             }
-            for row in results
+            for uri in sorted(self._nodes)
         ]
+        return self._components_cache
 
     def get_component(self, uri: str) -> dict | None:
         """Get metadata for a single component by URI."""
-        results = self.graph.query(
-            """
-            SELECT ?name ?help ?configKey ?readme WHERE {
-                ?uri htmpl:name ?name .
-                OPTIONAL { ?uri htmpl:help ?help }
-                OPTIONAL { ?uri htmpl:configKey ?configKey }
-                OPTIONAL { ?uri htmpl:readme ?readme }
-            }
-            """,
-            initBindings={"uri": HTMPL[uri]},
-        )
-        rows = list(results)
-        if not rows:
+        name = self._name.get(uri)
+        if name is None:
             return None
-        row = rows[0]
-        installed = self.get_installed()
-        encoded = str(row[3]) if row[3] else None
-        readme = _decode_readme(encoded) if encoded else ""
         return {
             "uri": uri,
-            "name": str(row[0]),
-            "help": str(row[1]) if row[1] else "",
-            "config_key": str(row[2]) if row[2] else None,
-            "installed": uri in installed,
-            "readme": readme,
+            "name": name,
+            "help": self._help.get(uri, ""),
+            "config_key": self._config_key.get(uri),
+            "installed": uri in self._installed,
+            "readme": self.get_readme(uri) or "",
         }
 
     def get_readme(self, uri: str) -> str | None:
         """Get decoded README content for a component."""
-        results = self.graph.query(
-            """
-            SELECT ?readme WHERE {
-                ?uri htmpl:readme ?readme .
-            }
-            """,
-            initBindings={"uri": HTMPL[uri]},
-        )
-        rows = list(results)
-        if not rows:
-            return None
-        encoded = str(rows[0][0])
-        return _decode_readme(encoded)
+        # Decoded on first request only, most components are never viewed
+        if (text := self._readme_text.get(uri)) is None:
+            encoded = self._readme.get(uri)
+            if encoded is None:
+                return None
+            text = self._readme_text[uri] = _decode_readme(encoded)
+        return text
 
     def component_factory(self, component_cls: type):
         """Create a factory function for svcs registry.
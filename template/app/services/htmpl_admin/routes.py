@@ -1,5 +1,9 @@
 """HTMPL Admin dashboard routes."""
 
+from collections.abc import Callable
+from functools import lru_cache
+from string.templatelib import Template
+
 from fastapi import APIRouter, Request
 from svcs.fastapi import DepContainer
 
@@ -12,6 +16,8 @@ from ...types import TComponentGraph
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
+# READMEs are fixed per release, keep the rendered HTML instead of reparsing
+@lru_cache(maxsize=128)
 def render_markdown(content: str) -> SafeHTML:
     """Render markdown to HTML, marked safe for template insertion."""
     return SafeHTML(str(mistune.html(content)))
@@ -26,7 +32,10 @@ def AdminPage(children, *, title: str = "HTMPL Admin"):
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1">
     <title>{title}</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@picocss/pico@2/css/pico.min.css">
+    <link rel="preconnect" href="https://cdn.jsdelivr.net">
+    <link rel="preconnect" href="https://cdnjs.cloudflare.com">
+    <link rel="preconnect" href="https://unpkg.com">
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@picocss/pico@2.1.1/css/pico.min.css">
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/github-dark.min.css">
     <script src="https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/highlight.min.js"></script>
 </head>
@@ -49,10 +58,17 @@ def AdminPage(children, *, title: str = "HTMPL Admin"):
 
 # Templates
 
+# Fixed fragments, built once and shared by every render
+_EMPTY = t''
+# Badges are leaf markup, pre-rendered so table rows don't nest a template each
+_BADGE_INSTALLED = SafeHTML('<mark>Installed</mark>')
+_BADGE_AVAILABLE = SafeHTML('<mark class="secondary">Available</mark>')
+_ALL_INSTALLED = t'<article><p>All selected components are already installed.</p></article>'
+_NONE_SELECTED = t'<article class="secondary"><p>No components selected.</p></article>'
+
+
 def StatusBadge(installed: bool):
-    if installed:
-        return t'<mark>Installed</mark>'
-    return t'<mark class="secondary">Available</mark>'
+    return _BADGE_INSTALLED if installed else _BADGE_AVAILABLE
 
 
 def ComponentCard(component: dict, deps: set[str], python_deps: set[str]):
@@ -62,14 +78,14 @@ def ComponentCard(component: dict, deps: set[str], python_deps: set[str]):
     installed = component["installed"]
     readme = component["readme"]
 
-    config_info = t'<small><code>copier: {config_key}</code></small>' if config_key else t''
+    config_info = t'<small><code>copier: {config_key}</code></small>' if config_key else _EMPTY
 
-    dep_list = t''
+    dep_list = _EMPTY
     if deps:
         dep_items = [t'<li><a href="/admin/component/{d}">{d}</a></li>' for d in sorted(deps)]
         dep_list = t'<details><summary>Dependencies ({len(deps)})</summary><ul>{dep_items}</ul></details>'
 
-    python_list = t''
+    python_list = _EMPTY
     if python_deps:
         py_items = [t'<li><code>{p}</code></li>' for p in sorted(python_deps)]
         python_list = t'<details><summary>Python packages ({len(python_deps)})</summary><ul>{py_items}</ul></details>'
@@ -93,15 +109,15 @@ def ComponentCard(component: dict, deps: set[str], python_deps: set[str]):
 
 
 def ComponentTable(components: list[dict]):
-    rows = []
-    for c in components:
-        uri = c["uri"]
-        rows.append(t'''<tr>
-            <td><a href="/admin/component/{uri}">{c["name"]}</a></td>
-            <td><code>{uri}</code></td>
+    rows = [
+        t'''<tr>
+            <td><a href="/admin/component/{c["uri"]}">{c["name"]}</a></td>
+            <td><code>{c["uri"]}</code></td>
             <td>{c["config_key"] or "-"}</td>
             <td>{StatusBadge(c["installed"])}</td>
-        </tr>''')
+        </tr>'''
+        for c in components
+    ]
 
     return t'''<table>
         <thead>
@@ -120,12 +136,13 @@ def ResolveForm(components: list[dict]):
     """Form to select components and resolve dependencies."""
     available = [c for c in components if not c["installed"] and c["config_key"]]
 
-    checkboxes = []
-    for c in available:
-        checkboxes.append(t'''<label>
+    checkboxes = [
+        t'''<label>
             <input type="checkbox" name="selected" value={c["uri"]}>
             {c["name"]} <small class="secondary">({c["uri"]})</small>
-        </label>''')
+        </label>'''
+        for c in available
+    ]
 
     return t'''<form hx-post="/admin/resolve" hx-target="#resolve-result" hx-swap="innerHTML">
         <fieldset>
@@ -139,7 +156,7 @@ def ResolveForm(components: list[dict]):
 
 def ResolveResult(needed: set[str], config_keys: dict[str, str], python_deps: set[str]):
     if not needed:
-        return t'<article><p>All selected components are already installed.</p></article>'
+        return _ALL_INSTALLED
 
     uri_items = [t'<li><code>{uri}</code></li>' for uri in sorted(needed)]
 
@@ -155,26 +172,22 @@ def ResolveResult(needed: set[str], config_keys: dict[str, str], python_deps: se
         <h5>Copier command</h5>
         <pre><code>copier update --data {copier_answers}</code></pre>
 
-        {t'<h5>Python dependencies</h5><pre><code>{uv_command}</code></pre>' if uv_command else t''}
+        {t'<h5>Python dependencies</h5><pre><code>{uv_command}</code></pre>' if uv_command else _EMPTY}
     </article>'''
 
 
-# Routes
-
-@router.get("")
-async def admin_index(services: DepContainer):
-    graph: TComponentGraph = await services.aget(TComponentGraph)
-    components = graph.all_components()
-
-    # Split into components and services
-    comp_list = [c for c in components if c["uri"].startswith("components/")]
-    svc_list = [c for c in components if c["uri"].startswith("services/")]
-
-    installed_count = sum(1 for c in components if c["installed"])
+def Dashboard(components: list[dict]):
+    # Split into components and services, counting installed on the way
+    comp_list, svc_list, installed_count = [], [], 0
+    for c in components:
+        installed_count += c["installed"]
+        uri = c["uri"]
+        if uri.startswith("components/"):
+            comp_list.append(c)
+        elif uri.startswith("services/"):
+            svc_list.append(c)
 
-    return await render_html(t'''
-        <{AdminPage} title="HTMPL Admin - Dashboard">
-        <hgroup>
+    return t'''<hgroup>
             <h1>Component Dashboard</h1>
             <p>{len(components)} total components, {installed_count} installed</p>
         </hgroup>
@@ -187,7 +200,38 @@ async def admin_index(services: DepContainer):
         <section>
             <h2>Services ({len(svc_list)})</h2>
             {ComponentTable(svc_list)}
-        </section>
+        </section>'''
+
+
+# Rendered fragments per page, with the components list they were built from
+_FRAGMENTS: dict[str, tuple[list[dict], SafeHTML]] = {}
+
+
+def _rendered(
+    components: list[dict], build: Callable[[list[dict]], Template]
+) -> SafeHTML:
+    """Render build(components) once per all_components() snapshot.
+
+    The graph returns the same list until installed status changes, so
+    identity tells us when the cached HTML is stale.
+    """
+    cached = _FRAGMENTS.get(build.__name__)
+    if cached is None or cached[0] is not components:
+        fragment = SafeHTML(str(html(build(components))))
+        cached = _FRAGMENTS[build.__name__] = (components, fragment)
+    return cached[1]
+
+
+# Routes
+
+@router.get("")
+async def admin_index(services: DepContainer):
+    graph: TComponentGraph = await services.aget(TComponentGraph)
+    dashboard = _rendered(graph.all_components(), Dashboard)
+
+    return await render_html(t'''
+        <{AdminPage} title="HTMPL Admin - Dashboard">
+        {dashboard}
         </{AdminPage}>
     ''')
 
@@ -228,7 +272,7 @@ async def component_detail(uri: str, services: DepContainer):
 @router.get("/resolve")
 async def resolve_page(services: DepContainer):
     graph: TComponentGraph = await services.aget(TComponentGraph)
-    components = graph.all_components()
+    form = _rendered(graph.all_components(), ResolveForm)
 
     return await render_html(t'''
         <{AdminPage} title="HTMPL Admin - Resolve">
@@ -237,7 +281,7 @@ async def resolve_page(services: DepContainer):
             <p>Select components to install and see all required dependencies</p>
         </hgroup>
 
-        {ResolveForm(components)}
+        {form}
         </{AdminPage}>
     ''')
 
@@ -250,16 +294,13 @@ async def resolve_dependencies(request: Request, services: DepContainer):
     selected = form.getlist("selected")
 
     if not selected:
-        return await render_html(t'<article class="secondary"><p>No components selected.</p></article>')
+        return await render_html(_NONE_SELECTED)
 
     needed = graph.resolve(
         list(selected), # type: ignore
     )
     config_keys = graph.get_config_keys(list(needed))
 
-    # Collect all python deps
-    python_deps: set[str] = set()
-    for uri in needed:
-        python_deps |= graph.get_python_deps(uri)
+    python_deps = graph.get_python_deps_bulk(needed)
 
     return await render_html(ResolveResult(needed, config_keys, python_deps))
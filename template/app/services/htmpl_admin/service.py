@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 import click
@@ -5,7 +6,7 @@ from cuneus import BaseExtension
 from fastapi import FastAPI
 from svcs import Registry, Container
 
-from .graph import ComponentGraph
+from .graph import CURRENT_DIR, ComponentGraph
 from .routes import router
 from ...settings import AppSettings
 from ...types import TComponentGraph
@@ -15,9 +16,31 @@ class HTMPLAdmin(BaseExtension):
 
     def __init__(self, settings: AppSettings | None = None):
         self.settings = settings or AppSettings()
+        self._graph: ComponentGraph | None = None
+        self._graph_key: tuple[int, int] | None = None
+        self._graph_lock = asyncio.Lock()
 
-    def _graph_factory(self, container: Container) -> ComponentGraph:
-        return ComponentGraph(project_dir=self.settings.project_dir)
+    async def _graph_factory(self, container: Container) -> ComponentGraph:
+        # Parsing components.ttl dominates the request, only redo it when
+        # the file changes. Installed status still tracks the project dir.
+        ttl_path = CURRENT_DIR / "components.ttl"
+        try:
+            stat = ttl_path.stat()
+            key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            key = None
+        if self._graph is None or key is None or key != self._graph_key:
+            # Requests arriving mid-rebuild wait for it instead of parsing again
+            async with self._graph_lock:
+                if self._graph is None or key is None or key != self._graph_key:
+                    # Keep the blocking file read and parse off the event loop
+                    self._graph = await asyncio.to_thread(
+                        ComponentGraph, ttl_path, self.settings.project_dir
+                    )
+                    self._graph_key = key
+                    return self._graph
+        self._graph.refresh_installed()
+        return self._graph
 
     async def startup(self, registry: Registry, app: FastAPI) -> dict[str, Any]:
         registry.register_factory(TComponentGraph, self._graph_factory)
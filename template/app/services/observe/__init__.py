@@ -1,7 +1,6 @@
 # cuneus/ext/observability/__init__.py
 from .extension import ObservabilityExtension, ObservabilitySettings
 from .store import InMemoryStore, TraceRecord, SpanRecord, ExceptionRecord
-from .exporter import StoreSpanExporter
 
 __all__ = [
     "ObservabilityExtension",
@@ -12,3 +11,14 @@ __all__ = [
     "ExceptionRecord",
     "StoreSpanExporter",
 ]
+
+
+def __getattr__(name: str):
+    # The exporter needs the OpenTelemetry SDK, which generated apps install
+    # but this repo's dev environment does not. Loading it on first access
+    # keeps the store and pages importable without it.
+    if name == "StoreSpanExporter":
+        from .exporter import StoreSpanExporter
+
+        return StoreSpanExporter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
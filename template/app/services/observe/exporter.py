@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from types import MappingProxyType
 
 from opentelemetry.sdk.trace import ReadableSpan
 from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
@@ -17,48 +18,60 @@ class StoreSpanExporter(SpanExporter):
         self.store = store
 
     def export(self, spans: list[ReadableSpan]) -> SpanExportResult:
+        span_records: list[SpanRecord] = []
+        trace_records: list[TraceRecord] = []
+
         for span in spans:
             assert span.context
             assert span.start_time
             assert span.end_time
 
-            trace_id = format(span.context.trace_id, "032x")
-            span_id = format(span.context.span_id, "016x")
-            parent_id = format(span.parent.span_id, "016x") if span.parent else None
+            trace_id = span.context.trace_id.to_bytes(16, "big").hex()
+            span_id = span.context.span_id.to_bytes(8, "big").hex()
+            parent_id = (
+                span.parent.span_id.to_bytes(8, "big").hex() if span.parent else None
+            )
 
-            started = datetime.fromtimestamp(span.start_time / 1e9, tz=timezone.utc)
             duration = (span.end_time - span.start_time) // 1_000_000
             status = "ERROR" if span.status.status_code == StatusCode.ERROR else "OK"
 
-            # Insert span
-            self.store.insert_span(
+            span_records.append(
                 SpanRecord(
                     trace_id=trace_id,
                     span_id=span_id,
                     parent_span_id=parent_id,
                     name=span.name,
                     kind=span.kind.name if span.kind else "INTERNAL",
-                    started_at=started,
+                    started_ns=span.start_time,
                     duration_ms=duration,
                     status=status,
-                    attributes=dict(span.attributes) if span.attributes else None,
+                    attributes=(
+                        MappingProxyType(span.attributes) if span.attributes else None
+                    ),
                     events=_serialize_events(span.events),
                 )
             )
 
             # Insert/update trace for root spans
             if parent_id is None:
-                self.store.insert_trace(
+                trace_records.append(
                     TraceRecord(
                         trace_id=trace_id,
                         root_span_name=span.name,
                         service=_get_service(span),
-                        started_at=started,
+                        started_at=datetime.fromtimestamp(
+                            span.start_time / 1e9, tz=timezone.utc
+                        ),
                         duration_ms=duration,
                         status=status,
                     )
                 )
 
+        # One store call per batch rather than per span
+        self.store.insert_spans(span_records)
+        if trace_records:
+            self.store.insert_traces(trace_records)
+
         return SpanExportResult.SUCCESS
 
     def shutdown(self) -> None:
@@ -72,13 +85,15 @@ def _get_service(span: ReadableSpan) -> str:
 
 
 def _serialize_events(events) -> list | None:
+    # Finished spans hold frozen attributes, so read-only views are enough;
+    # stores that persist records must copy them out themselves.
     if not events:
         return None
     return [
         {
             "name": e.name,
             "timestamp": e.timestamp,
-            "attributes": dict(e.attributes) if e.attributes else {},
+            "attributes": MappingProxyType(e.attributes) if e.attributes else {},
         }
         for e in events
     ]
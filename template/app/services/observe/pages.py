@@ -1,10 +1,95 @@
+import hashlib
+import json
+from collections import defaultdict
+from collections.abc import Iterator, Mapping
+from datetime import datetime, timezone
 from string.templatelib import Template
+from urllib.parse import urlencode
 import structlog
+from tdom import html
+from htmpl.core import SafeHTML
 
 from .store import DashboardStats, TraceRecord, SpanRecord, ExceptionRecord
 
 logger = structlog.stdlib.get_logger(__name__)
 
+# Served from routes.py with a long cache lifetime; the version query string
+# changes whenever the stylesheet does.
+STYLESHEET = """
+    :root { --pico-font-size: 15px; }
+    .admin-grid { display: grid; grid-template-columns: 180px 1fr; min-height: 100vh; }
+    .admin-nav { background: var(--pico-card-background-color); border-right: 1px solid var(--pico-muted-border-color); padding: 1rem; }
+    .admin-nav ul { padding: 0; margin-top: 1rem; }
+    .stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 1rem; margin-bottom: 1rem; }
+    .stat-card { text-align: center; }
+    .stat-card strong { font-size: 1.75rem; display: block; }
+
+    /* Waterfall */
+    .waterfall-table { width: 100%; }
+    .waterfall-table details { width: 100%; }
+    .waterfall-table summary { cursor: pointer; list-style: none; }
+    .waterfall-table summary::-webkit-details-marker { display: none; }
+
+    .span-row {
+        display: grid;
+        grid-template-columns: 1fr auto 50%;
+        align-items: center;
+        gap: 1rem;
+        padding: 0.5rem 0;
+    }
+    .span-name { white-space: pre; font-size: 0.85rem; }
+    .span-meta { display: flex; gap: 0.5rem; align-items: center; }
+    .span-duration { font-size: 0.75rem; color: var(--pico-muted-color); min-width: 60px; text-align: right; }
+
+    .waterfall-track { height: 1.25rem; background: var(--pico-muted-border-color); border-radius: 3px; position: relative; }
+    .waterfall-bar { height: 100%; border-radius: 3px; position: absolute; }
+    .waterfall-bar.ok { background: var(--pico-primary); }
+    .waterfall-bar.error { background: var(--pico-del-color); }
+
+    .waterfall details { border-bottom: 1px solid var(--pico-muted-border-color); }
+    .waterfall summary { display: flex; align-items: center; gap: 1rem; padding: 0.5rem 0; }
+    .waterfall summary code { flex: 1; white-space: pre; }
+    .waterfall summary small { min-width: 50px; text-align: right; color: var(--pico-muted-color); }
+    .waterfall .waterfall-track { width: 200px; }
+
+    /* Span kinds */
+    .kind-server { background: var(--pico-primary-background); color: var(--pico-primary); }
+    .kind-client { background: #d4edda; color: #155724; }
+    .kind-producer { background: #fff3cd; color: #856404; }
+    .kind-consumer { background: #f8d7da; color: #721c24; }
+    .kind-internal { background: var(--pico-muted-border-color); color: var(--pico-muted-color); }
+
+    /* Span details */
+    .span-details {
+        padding: 1rem;
+        margin: 0.5rem 0;
+        background: var(--pico-card-background-color);
+        border-radius: 4px;
+        border-left: 3px solid var(--pico-primary);
+    }
+    .span-details-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }
+    .span-details h4 { margin: 0 0 0.5rem 0; font-size: 0.85rem; color: var(--pico-muted-color); }
+    .span-details dl { margin: 0; font-size: 0.85rem; }
+    .span-details dt { color: var(--pico-muted-color); }
+    .span-details dd { margin: 0 0 0.25rem 0; }
+
+    .span-attributes { margin-top: 1rem; }
+    .span-attributes table { font-size: 0.8rem; margin: 0; }
+    .span-attributes td { padding: 0.25rem 0.5rem; }
+    .span-attributes td:first-child { width: 40%; color: var(--pico-muted-color); }
+
+    .span-events { margin-top: 1rem; }
+    .event { margin-bottom: 0.5rem; font-size: 0.85rem; }
+    .event-exception { color: var(--pico-del-color); }
+    .event pre { margin: 0.25rem 0 0 0; font-size: 0.75rem; max-height: 200px; overflow: auto; }
+
+    pre { font-size: 0.8rem; }
+"""
+
+STYLESHEET_VERSION = hashlib.sha256(STYLESHEET.encode()).hexdigest()[:12]
+STYLESHEET_URL = f"/admin/observe.css?v={STYLESHEET_VERSION}"
+
+
 def _layout(children, title: str = "Observation") -> Template:
     return t"""<!DOCTYPE html>
 <html lang="en" data-theme="light">
@@ -12,89 +97,11 @@ def _layout(children, title: str = "Observation") -> Template:
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1">
     <title>{title} · Admin</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@picocss/pico@2/css/pico.min.css">
-    <script src="https://unpkg.com/htmx.org@2"></script>
-    <style>
-        :root {{ --pico-font-size: 15px; }}
-        .admin-grid {{ display: grid; grid-template-columns: 180px 1fr; min-height: 100vh; }}
-        .admin-nav {{ background: var(--pico-card-background-color); border-right: 1px solid var(--pico-muted-border-color); padding: 1rem; }}
-        .admin-nav ul {{ padding: 0; margin-top: 1rem; }}
-        .stats-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 1rem; margin-bottom: 1rem; }}
-        .stat-card {{ text-align: center; }}
-        .stat-card strong {{ font-size: 1.75rem; display: block; }}
-        .waterfall-track {{ height: 1.25rem; background: var(--pico-muted-border-color); border-radius: 3px; position: relative; }}
-        .waterfall-bar {{ height: 100%; border-radius: 3px; position: absolute; }}
-        .waterfall-bar.ok {{ background: var(--pico-primary); }}
-        .waterfall-bar.error {{ background: var(--pico-del-color); }}
-
-        .admin-grid {{ display: grid; grid-template-columns: 180px 1fr; min-height: 100vh; }}
-        .admin-nav {{ background: var(--pico-card-background-color); border-right: 1px solid var(--pico-muted-border-color); padding: 1rem; }}
-        .admin-nav ul {{ padding: 0; margin-top: 1rem; }}
-        .stats-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 1rem; margin-bottom: 1rem; }}
-        .stat-card {{ text-align: center; }}
-        .stat-card strong {{ font-size: 1.75rem; display: block; }}
-
-        /* Waterfall */
-        .waterfall-table {{ width: 100%; }}
-        .waterfall-table details {{ width: 100%; }}
-        .waterfall-table summary {{ cursor: pointer; list-style: none; }}
-        .waterfall-table summary::-webkit-details-marker {{ display: none; }}
-
-        .span-row {{
-            display: grid;
-            grid-template-columns: 1fr auto 50%;
-            align-items: center;
-            gap: 1rem;
-            padding: 0.5rem 0;
-        }}
-        .span-name {{ white-space: pre; font-size: 0.85rem; }}
-        .span-meta {{ display: flex; gap: 0.5rem; align-items: center; }}
-        .span-duration {{ font-size: 0.75rem; color: var(--pico-muted-color); min-width: 60px; text-align: right; }}
-
-        .waterfall-track {{ height: 1.25rem; background: var(--pico-muted-border-color); border-radius: 3px; position: relative; }}
-        .waterfall-bar {{ height: 100%; border-radius: 3px; position: absolute; }}
-        .waterfall-bar.ok {{ background: var(--pico-primary); }}
-        .waterfall-bar.error {{ background: var(--pico-del-color); }}
-
-        .waterfall details {{ border-bottom: 1px solid var(--pico-muted-border-color); }}
-        .waterfall summary {{ display: flex; align-items: center; gap: 1rem; padding: 0.5rem 0; }}
-        .waterfall summary code {{ flex: 1; white-space: pre; }}
-        .waterfall summary small {{ min-width: 50px; text-align: right; color: var(--pico-muted-color); }}
-        .waterfall .waterfall-track {{ width: 200px; }}
-
-        /* Span kinds */
-        .kind-server {{ background: var(--pico-primary-background); color: var(--pico-primary); }}
-        .kind-client {{ background: #d4edda; color: #155724; }}
-        .kind-producer {{ background: #fff3cd; color: #856404; }}
-        .kind-consumer {{ background: #f8d7da; color: #721c24; }}
-        .kind-internal {{ background: var(--pico-muted-border-color); color: var(--pico-muted-color); }}
-
-        /* Span details */
-        .span-details {{
-            padding: 1rem;
-            margin: 0.5rem 0;
-            background: var(--pico-card-background-color);
-            border-radius: 4px;
-            border-left: 3px solid var(--pico-primary);
-        }}
-        .span-details-grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }}
-        .span-details h4 {{ margin: 0 0 0.5rem 0; font-size: 0.85rem; color: var(--pico-muted-color); }}
-        .span-details dl {{ margin: 0; font-size: 0.85rem; }}
-        .span-details dt {{ color: var(--pico-muted-color); }}
-        .span-details dd {{ margin: 0 0 0.25rem 0; }}
-
-        .span-attributes {{ margin-top: 1rem; }}
-        .span-attributes table {{ font-size: 0.8rem; margin: 0; }}
-        .span-attributes td {{ padding: 0.25rem 0.5rem; }}
-        .span-attributes td:first-child {{ width: 40%; color: var(--pico-muted-color); }}
-
-        .span-events {{ margin-top: 1rem; }}
-        .event {{ margin-bottom: 0.5rem; font-size: 0.85rem; }}
-        .event-exception {{ color: var(--pico-del-color); }}
-        .event pre {{ margin: 0.25rem 0 0 0; font-size: 0.75rem; max-height: 200px; overflow: auto; }}
-
-        pre {{ font-size: 0.8rem; }}
-    </style>
+    <link rel="preconnect" href="https://cdn.jsdelivr.net">
+    <link rel="preconnect" href="https://unpkg.com">
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@picocss/pico@2.1.1/css/pico.min.css">
+    <script defer src="https://unpkg.com/htmx.org@2.0.4"></script>
+    <link rel="stylesheet" href="{STYLESHEET_URL}">
 </head>
 <body>
     <div class="admin-grid">
@@ -117,48 +124,78 @@ def _layout(children, title: str = "Observation") -> Template:
 </html>"""
 
 
-def _time_ago(dt) -> Template:
-    from datetime import datetime, timezone
+def _format_ts(dt: datetime) -> str:
+    """Format as YYYY-MM-DD HH:MM:SS (isoformat is C-level, unlike strftime)."""
+    # [:19] drops the "+00:00" offset on aware datetimes
+    return dt.isoformat(" ", "seconds")[:19]
 
-    now = datetime.now(timezone.utc)
+
+# (upper bound, unit, suffix) in seconds, checked in order after "just now"
+_TIME_AGO_UNITS = ((3600, 60, "m ago"), (86400, 3600, "h ago"))
+_JUST_NOW = t"just now"
+
+
+def _time_ago(dt: datetime, now: datetime | None = None) -> Template:
+    if now is None:
+        now = datetime.now(timezone.utc)
     delta = now - dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else now - dt
 
     seconds = int(delta.total_seconds())
     if seconds < 60:
-        return t"just now"
-    if seconds < 3600:
-        return t"{seconds // 60}m ago"
-    if seconds < 86400:
-        return t"{seconds // 3600}h ago"
+        return _JUST_NOW
+    for limit, unit, suffix in _TIME_AGO_UNITS:
+        if seconds < limit:
+            return t"{seconds // unit}{suffix}"
     return t"{seconds // 86400}d ago"
 
 
+# Placeholder swapped for streamed rows; comments pass through rendering as-is
+_ROWS_SLOT = SafeHTML("<!--rows-->")
+
+# Empty states, sized to each table's column count
+_EMPTY_RECENT_TRACES = t'<tr><td colspan="4"><em>No traces</em></td></tr>'
+_EMPTY_RECENT_EXCEPTIONS = t'<tr><td colspan="3"><em>No exceptions</em></td></tr>'
+_EMPTY_TRACES = t'<tr><td colspan="6"><em>No traces</em></td></tr>'
+_EMPTY_EXCEPTIONS = t'<tr><td colspan="4"><em>No exceptions</em></td></tr>'
+_EMPTY_SPANS = t"<p><em>No spans</em></p>"
+_NO_TRACE_LINK = t"<em>—</em>"
+
+_BADGE_ERROR = t'<mark data-status="error">ERROR</mark>'
+_BADGE_OK = t"<kbd>OK</kbd>"
+
+
 def _badge(status: str) -> Template:
-    if status == "ERROR":
-        return t'<mark data-status="error">ERROR</mark>'
-    return t"<kbd>OK</kbd>"
+    return _BADGE_ERROR if status == "ERROR" else _BADGE_OK
 
 
-def _pagination(page: int, total_pages: int, base_url: str) -> Template:
-    if total_pages <= 1:
+_PREV_DISABLED = t'<span aria-disabled="true">←</span>'
+_NEXT_DISABLED = t'<span aria-disabled="true">→</span>'
+
+
+def _pagination(
+    cursor_prev: object | None,
+    cursor_next: object | None,
+    base_url: str,
+    params: dict[str, str] | None = None,
+) -> Template:
+    """Prev/next links carrying keyset cursors as ?before= / ?after=."""
+    if cursor_prev is None and cursor_next is None:
         return t""
 
-    prev_link = (
-        t'<a href="{base_url}?page={page - 1}">←</a>'
-        if page > 1
-        else t'<span aria-disabled="true">←</span>'
-    )
-    next_link = (
-        t'<a href="{base_url}?page={page + 1}">→</a>'
-        if page < total_pages
-        else t'<span aria-disabled="true">→</span>'
-    )
+    params = {k: v for k, v in (params or {}).items() if v}
+    prev_link = _PREV_DISABLED
+    if cursor_prev is not None:
+        prev_href = f"{base_url}?{urlencode({**params, 'before': cursor_prev})}"
+        prev_link = t'<a href="{prev_href}">←</a>'
+    next_link = _NEXT_DISABLED
+    if cursor_next is not None:
+        next_href = f"{base_url}?{urlencode({**params, 'after': cursor_next})}"
+        next_link = t'<a href="{next_href}">→</a>'
 
     return t"""
     <nav>
         <ul>
             <li>{prev_link}</li>
-            <li><span>{page} / {total_pages}</span></li>
             <li>{next_link}</li>
         </ul>
     </nav>
@@ -171,22 +208,25 @@ def _pagination(page: int, total_pages: int, base_url: str) -> Template:
 
 
 def dashboard_page(stats: DashboardStats) -> Template:
-    traces_rows = t""
-    for t in stats.recent_traces:
-        traces_rows += t"""<tr>
+    now = datetime.now(timezone.utc)
+    traces_rows = [
+        t"""<tr>
             <td><a href="/admin/traces/{t.trace_id}"><code>{t.trace_id[:12]}…</code></a></td>
             <td>{t.root_span_name}</td>
             <td>{t.duration_ms}ms</td>
             <td>{_badge(t.status)}</td>
         </tr>"""
+        for t in stats.recent_traces
+    ]
 
-    exceptions_rows = t""
-    for e in stats.recent_exceptions:
-        exceptions_rows += t"""<tr>
+    exceptions_rows = [
+        t"""<tr>
             <td><a href="/admin/exceptions/{e.id}">{e.exc_type}</a></td>
-            <td><small>{e.message[:50]}{'…' if len(e.message) > 50 else ''}</small></td>
-            <td><small>{_time_ago(e.ts)}</small></td>
+            <td><small>{e.message_preview}</small></td>
+            <td><small>{_time_ago(e.ts, now)}</small></td>
         </tr>"""
+        for e in stats.recent_exceptions
+    ]
 
     return t"""
     <{_layout} title="Dashboard">
@@ -201,11 +241,11 @@ def dashboard_page(stats: DashboardStats) -> Template:
         </article>
         <article class="stat-card">
             <small>Error Rate</small>
-            <strong>{stats.error_rate:.1f}%</strong>
+            <strong>{stats.error_rate_str}</strong>
         </article>
         <article class="stat-card">
             <small>Avg Duration</small>
-            <strong>{stats.avg_duration_ms:.0f}ms</strong>
+            <strong>{stats.avg_duration_ms_str}</strong>
         </article>
     </div>
 
@@ -218,7 +258,7 @@ def dashboard_page(stats: DashboardStats) -> Template:
             <figure>
                 <table>
                     <thead><tr><th>Trace</th><th>Name</th><th>Duration</th><th>Status</th></tr></thead>
-                    <tbody>{traces_rows if traces_rows else '<tr><td colspan="4"><em>No traces</em></td></tr>'}</tbody>
+                    <tbody>{traces_rows or _EMPTY_RECENT_TRACES}</tbody>
                 </table>
             </figure>
         </article>
@@ -231,7 +271,7 @@ def dashboard_page(stats: DashboardStats) -> Template:
             <figure>
                 <table>
                     <thead><tr><th>Type</th><th>Message</th><th>When</th></tr></thead>
-                    <tbody>{exceptions_rows if exceptions_rows else '<tr><td colspan="3"><em>No exceptions</em></td></tr>'}</tbody>
+                    <tbody>{exceptions_rows or _EMPTY_RECENT_EXCEPTIONS}</tbody>
                 </table>
             </figure>
         </article>
@@ -245,20 +285,23 @@ def dashboard_page(stats: DashboardStats) -> Template:
 # -----------------------------------------------------------------------------
 
 
-def traces_page(
-    traces: list[TraceRecord], page: int, total_pages: int, status_filter: str | None
-) -> Template:
-    rows = t""
-    for t in traces:
-        rows += t"""<tr>
+def _trace_row(t: TraceRecord) -> Template:
+    return t"""<tr>
             <td><a href="/admin/traces/{t.trace_id}"><code>{t.trace_id[:12]}…</code></a></td>
             <td>{t.root_span_name}</td>
             <td>{t.service}</td>
-            <td><small>{t.started_at:%Y-%m-%d %H:%M:%S}</small></td>
+            <td><small>{_format_ts(t.started_at)}</small></td>
             <td>{t.duration_ms}ms</td>
             <td>{_badge(t.status)}</td>
         </tr>"""
 
+
+def _traces_shell(
+    rows: object,
+    cursor_prev: str | None,
+    cursor_next: str | None,
+    status_filter: str | None,
+) -> Template:
     return t"""
     <{_layout} title="Traces">
     <form method="get" action="/admin/traces">
@@ -277,16 +320,55 @@ def traces_page(
                 <tr><th>Trace</th><th>Name</th><th>Service</th><th>Time</th><th>Duration</th><th>Status</th></tr>
             </thead>
             <tbody>
-                {rows if rows else '<tr><td colspan="6"><em>No traces</em></td></tr>'}
+                {rows or _EMPTY_TRACES}
             </tbody>
         </table>
     </figure>
 
-    {_pagination(page, total_pages, '/admin/traces')}
+    {_pagination(cursor_prev, cursor_next, '/admin/traces', {'status': status_filter})}
     </{_layout}>
     """
 
 
+def traces_page(
+    traces: list[TraceRecord],
+    cursor_prev: str | None,
+    cursor_next: str | None,
+    status_filter: str | None,
+) -> Template:
+    rows = [_trace_row(t) for t in traces]
+    return _traces_shell(rows, cursor_prev, cursor_next, status_filter)
+
+
+# Pages with fewer rows render in one pass; streaming them costs a html()
+# call and a chunk per row and gets the first byte out no sooner
+TRACES_STREAM_MIN_ROWS = 200
+
+
+def traces_page_stream(
+    traces: list[TraceRecord],
+    cursor_prev: str | None,
+    cursor_next: str | None,
+    status_filter: str | None,
+) -> Iterator[str]:
+    """Render the traces page as HTML chunks, one per row, for streaming.
+
+    Chunks bypass render_html, so async components on the page are not
+    processed, and a render error after the first chunk leaves a truncated
+    page behind a 200. Only use it for pages of TRACES_STREAM_MIN_ROWS or more.
+    """
+    # html() returns a node tree, StreamingResponse needs str chunks
+    if not traces:
+        yield str(html(traces_page(traces, cursor_prev, cursor_next, status_filter)))
+        return
+    shell = _traces_shell(_ROWS_SLOT, cursor_prev, cursor_next, status_filter)
+    head, tail = str(html(shell)).split(_ROWS_SLOT.content, 1)
+    yield head
+    for trace in traces:
+        yield str(html(_trace_row(trace)))
+    yield tail
+
+
 def trace_detail_page(trace: TraceRecord, spans: list[SpanRecord]) -> Template:
     return t"""
     <{_layout} title="Trace: {trace.root_span_name}">
@@ -301,7 +383,7 @@ def trace_detail_page(trace: TraceRecord, spans: list[SpanRecord]) -> Template:
             <dt>Service</dt><dd>{trace.service}</dd>
             <dt>Duration</dt><dd>{trace.duration_ms}ms</dd>
             <dt>Status</dt><dd>{_badge(trace.status)}</dd>
-            <dt>Started</dt><dd>{trace.started_at:%Y-%m-%d %H:%M:%S}</dd>
+            <dt>Started</dt><dd>{_format_ts(trace.started_at)}</dd>
         </dl>
     </article>
 
@@ -313,84 +395,84 @@ def trace_detail_page(trace: TraceRecord, spans: list[SpanRecord]) -> Template:
     """
 
 
-def _build_span_tree(spans: list[SpanRecord]) -> dict[str | None, list[SpanRecord]]:
-    """Group spans by parent_span_id."""
-    tree: dict[str | None, list[SpanRecord]] = {}
+def _build_span_tree(
+    spans: list[SpanRecord],
+) -> tuple[dict[str | None, list[SpanRecord]], int]:
+    """Group spans by parent_span_id, also returning the earliest start (ns)."""
+    tree: defaultdict[str | None, list[SpanRecord]] = defaultdict(list)
+    earliest = spans[0].started_ns
     for span in spans:
-        parent = span.parent_span_id
-        if parent not in tree:
-            tree[parent] = []
-        tree[parent].append(span)
-    return tree
+        tree[span.parent_span_id].append(span)
+        if span.started_ns < earliest:
+            earliest = span.started_ns
+    return tree, earliest
 
 
-def _get_span_depth(span: SpanRecord, spans_by_id: dict[str, SpanRecord]) -> int:
-    """Calculate nesting depth of a span."""
-    depth = 0
-    current = span
-    while current.parent_span_id and current.parent_span_id in spans_by_id:
-        depth += 1
-        current = spans_by_id[current.parent_span_id]
-    return depth
+_SPAN_KIND_CLASSES = {
+    "SERVER": "kind-server",
+    "CLIENT": "kind-client",
+    "PRODUCER": "kind-producer",
+    "CONSUMER": "kind-consumer",
+    "INTERNAL": "kind-internal",
+}
 
 
 def _span_kind_class(kind: str) -> str:
     """Map span kind to CSS class."""
-    return {
-        "SERVER": "kind-server",
-        "CLIENT": "kind-client",
-        "PRODUCER": "kind-producer",
-        "CONSUMER": "kind-consumer",
-        "INTERNAL": "kind-internal",
-    }.get(kind, "kind-internal")
+    return _SPAN_KIND_CLASSES.get(kind, "kind-internal")
 
 
 def _flatten_tree(
     tree: dict[str | None, list[SpanRecord]],
     parent_id: str | None = None
-) -> list[SpanRecord]:
-    """Flatten tree to list in display order (parent followed by children)."""
+) -> list[tuple[SpanRecord, int]]:
+    """Flatten tree to (span, depth) pairs in display order (parent then children)."""
     result = []
-    for span in tree.get(parent_id, []):
-        result.append(span)
-        result.extend(_flatten_tree(tree, span.span_id))
+    stack = [(span, 0) for span in reversed(tree.get(parent_id, []))]
+    while stack:
+        span, depth = stack.pop()
+        result.append((span, depth))
+        children = tree.get(span.span_id, [])
+        stack.extend((child, depth + 1) for child in reversed(children))
     return result
 
 
-def _waterfall(spans: list[SpanRecord], total_ms: int) -> Template:
-    if not spans or total_ms == 0:
-        return t"<p><em>No spans</em></p>"
-
-    trace_start = min(s.started_at for s in spans)
-    spans_by_id = {s.span_id: s for s in spans}
-    tree = _build_span_tree(spans)
-    ordered_spans = _flatten_tree(tree)
-
-    items = t""
-    for span in ordered_spans:
-        offset_ms = (span.started_at - trace_start).total_seconds() * 1000
-        left_pct = (offset_ms / total_ms * 100) if total_ms else 0
-        width_pct = max((span.duration_ms / total_ms * 100), 1) if total_ms else 0
-
-        depth = _get_span_depth(span, spans_by_id)
-        indent = "  " * depth
-
-        status_class = "error" if span.status == "ERROR" else "ok"
-
-        items += t"""
+def _span_row(span: SpanRecord, depth: int, left: int, width: int) -> Template:
+    """Render one waterfall row; left and width are in tenths of a percent."""
+    indent = "  " * depth
+    status_class = "error" if span.status == "ERROR" else "ok"
+    return t"""
         <details>
             <summary>
                 <code>{indent}{span.name}</code>
                 <kbd>{span.kind}</kbd>
                 <small>{span.duration_ms}ms</small>
                 <div class="waterfall-track">
-                    <div class="waterfall-bar {status_class}" style="left: {left_pct:.1f}%; width: {width_pct:.1f}%;"></div>
+                    <div class="waterfall-bar {status_class}" style="left: {left // 10}.{left % 10}%; width: {width // 10}.{width % 10}%;"></div>
                 </div>
             </summary>
             {_span_details(span)}
         </details>
         """
 
+
+def _waterfall(spans: list[SpanRecord], total_ms: int) -> Template:
+    if not spans or total_ms == 0:
+        return _EMPTY_SPANS
+
+    tree, trace_start = _build_span_tree(spans)
+
+    # Tenths of a percent of the trace per ms / per ns, so each row is a
+    # multiply and a round, and the bar style needs no float formatting
+    tenths_per_ms = 1000 / total_ms
+    tenths_per_ns = tenths_per_ms / 1_000_000
+
+    items: list[Template] = []
+    for span, depth in _flatten_tree(tree):
+        left = round((span.started_ns - trace_start) * tenths_per_ns)
+        width = max(round(span.duration_ms * tenths_per_ms), 10)
+        items.append(_span_row(span, depth, left, width))
+
     return t"""<div class="waterfall">{items}</div>"""
 
 
@@ -431,13 +513,14 @@ def _span_details(span: SpanRecord) -> Template:
     """
 
 
-def _attributes_table(attributes: dict | None) -> Template:
+def _attributes_table(attributes: Mapping | None) -> Template:
     if not attributes:
         return t""
 
-    rows = t""
-    for key, value in attributes.items():
-        rows += t"<tr><td><code>{key}</code></td><td>{value}</td></tr>"
+    rows = [
+        t"<tr><td><code>{key}</code></td><td>{value}</td></tr>"
+        for key, value in attributes.items()
+    ]
 
     return t"""
     <div class="span-attributes">
@@ -453,7 +536,7 @@ def _events_section(events: list | None) -> Template:
     if not events:
         return t""
 
-    items = t""
+    items: list[Template] = []
     for event in events:
         name = event.get("name", "unknown")
         attrs = event.get("attributes", {})
@@ -463,19 +546,19 @@ def _events_section(events: list | None) -> Template:
             exc_type = attrs.get("exception.type", "Exception")
             exc_msg = attrs.get("exception.message", "")
             exc_tb = attrs.get("exception.stacktrace", "")
-            items += t"""
+            items.append(t"""
             <div class="event event-exception">
                 <strong>{exc_type}</strong>: {exc_msg}
                 <pre><code>{exc_tb}</code></pre>
             </div>
-            """
+            """)
         else:
-            items += t"""
+            items.append(t"""
             <div class="event">
                 <strong>{name}</strong>
-                <pre><code>{attrs}</code></pre>
+                <pre><code>{str(dict(attrs))}</code></pre>
             </div>
-            """
+            """)
 
     return t"""
     <div class="span-events">
@@ -491,18 +574,20 @@ def _events_section(events: list | None) -> Template:
 
 
 def exceptions_page(
-    exceptions: list[ExceptionRecord], page: int, total_pages: int
+    exceptions: list[ExceptionRecord], cursor_prev: int | None, cursor_next: int | None
 ) -> Template:
-    rows = t""
-    for e in exceptions:
-        rows += t"""<tr>
+    now = datetime.now(timezone.utc)
+    rows = [
+        t"""<tr>
             <td><a href="/admin/exceptions/{e.id}">{e.exc_type}</a></td>
-            <td><small>{e.message[:60]}{'…' if len(e.message) > 60 else ''}</small></td>
+            <td><small>{e.message_preview}</small></td>
             <td>
-                {'<a href="/admin/traces/' + e.trace_id + '"><code>' + e.trace_id[:8] + '…</code></a>' if e.trace_id else '<em>—</em>'}
+                {t'<a href="/admin/traces/{e.trace_id}"><code>{e.trace_id[:8]}…</code></a>' if e.trace_id else _NO_TRACE_LINK}
             </td>
-            <td><small>{_time_ago(e.ts)}</small></td>
+            <td><small>{_time_ago(e.ts, now)}</small></td>
         </tr>"""
+        for e in exceptions
+    ]
 
     return t"""
     <{_layout} title="Exceptions">
@@ -510,22 +595,32 @@ def exceptions_page(
         <table>
             <thead><tr><th>Type</th><th>Message</th><th>Trace</th><th>When</th></tr></thead>
             <tbody>
-                {rows if rows else '<tr><td colspan="4"><em>No exceptions</em></td></tr>'}
+                {rows or _EMPTY_EXCEPTIONS}
             </tbody>
         </table>
     </figure>
 
-    {_pagination(page, total_pages, '/admin/exceptions')}
+    {_pagination(cursor_prev, cursor_next, '/admin/exceptions')}
     </{_layout}>
     """
 
 
+# Longer tracebacks are cut on the detail page and served whole as text
+TRACEBACK_DISPLAY_LIMIT = 64 * 1024
+
+
 def exception_detail_page(exc: ExceptionRecord) -> Template:
     trace_link = (
-        f'<a href="/admin/traces/{exc.trace_id}">{exc.trace_id}</a>'
+        t'<a href="/admin/traces/{exc.trace_id}">{exc.trace_id}</a>'
         if exc.trace_id
-        else "<em>Not linked</em>"
+        else t"<em>Not linked</em>"
     )
+    if len(exc.tb) > TRACEBACK_DISPLAY_LIMIT:
+        tb = exc.tb[:TRACEBACK_DISPLAY_LIMIT]
+        raw_url = f"/admin/exceptions/{exc.id}/tb.txt"
+        tb_note = t'<p><small>Truncated, <a href="{raw_url}">view raw</a></small></p>'
+    else:
+        tb, tb_note = exc.tb, t""
 
     return t"""
     <{_layout} title="Exception: {exc.exc_type}">
@@ -537,7 +632,7 @@ def exception_detail_page(exc: ExceptionRecord) -> Template:
             </hgroup>
         </header>
         <dl>
-            <dt>Time</dt><dd>{exc.ts:%Y-%m-%d %H:%M:%S}</dd>
+            <dt>Time</dt><dd>{_format_ts(exc.ts)}</dd>
             <dt>Trace</dt><dd>{trace_link}</dd>
             <dt>Fingerprint</dt><dd><code>{exc.fingerprint}</code></dd>
         </dl>
@@ -545,23 +640,30 @@ def exception_detail_page(exc: ExceptionRecord) -> Template:
 
     <article>
         <header>Traceback</header>
-        <pre><code>{exc.tb}</code></pre>
+        <pre><code>{tb}</code></pre>
+        {tb_note}
     </article>
 
-    {_context_section(exc.ctx)}
+    {_context_section(exc)}
     </{_layout}>
     """
 
 
-def _context_section(ctx: dict | None) -> Template:
-    if not ctx:
-        return t""
+def _context_json(exc: ExceptionRecord) -> str:
+    # Records are not edited after insert, so the dump is kept on the record
+    # and repeated views of a detail page reuse it
+    if exc.ctx_json is None:
+        exc.ctx_json = json.dumps(exc.ctx, indent=2, default=str)
+    return exc.ctx_json
+
 
-    import json
+def _context_section(exc: ExceptionRecord) -> Template:
+    if not exc.ctx:
+        return t""
 
     return t"""
     <article>
         <header>Request Context</header>
-        <pre><code>{json.dumps(ctx, indent=2)}</code></pre>
+        <pre><code>{_context_json(exc)}</code></pre>
     </article>
     """
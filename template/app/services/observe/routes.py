@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Query
-from fastapi.responses import HTMLResponse
+from fastapi.responses import (
+    HTMLResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 
 from svcs.fastapi import DepContainer
 
-from htmpl import render_html
+from htmpl.core import render_html
 
 from .store import Store
 from .pages import (
+    STYLESHEET,
+    TRACES_STREAM_MIN_ROWS,
     dashboard_page,
     traces_page,
+    traces_page_stream,
     trace_detail_page,
     exceptions_page,
     exception_detail_page,
@@ -20,6 +28,16 @@ from .pages import (
 router = APIRouter()
 
 
+@router.get("/observe.css")
+async def stylesheet():
+    # Links carry a content hash, so the response never changes for a URL
+    return Response(
+        STYLESHEET,
+        media_type="text/css",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
 @router.get("")
 @router.get("/")
 async def dashboard(container: DepContainer):
@@ -31,13 +49,20 @@ async def dashboard(container: DepContainer):
 @router.get("/traces")
 async def traces(
     container: DepContainer,
-    page: int = Query(1, ge=1),
+    after: str | None = Query(None),
+    before: str | None = Query(None),
     status: str | None = Query(None),
 ):
     store = await container.aget(Store)
-    items, total = store.get_traces(page=page, status=status)
-    total_pages = (total + 49) // 50
-    return await render_html(traces_page(items, page, total_pages, status))
+    items, cursor_prev, cursor_next = store.get_traces(
+        after=after, before=before, status=status
+    )
+    if len(items) < TRACES_STREAM_MIN_ROWS:
+        return await render_html(traces_page(items, cursor_prev, cursor_next, status))
+    return StreamingResponse(
+        traces_page_stream(items, cursor_prev, cursor_next, status),
+        media_type="text/html",
+    )
 
 
 @router.get("/traces/{trace_id}")
@@ -51,11 +76,14 @@ async def trace_detail(container: DepContainer, trace_id: str):
 
 
 @router.get("/exceptions")
-async def exceptions(container: DepContainer, page: int = Query(1, ge=1)):
+async def exceptions(
+    container: DepContainer,
+    after: int | None = Query(None),
+    before: int | None = Query(None),
+):
     store = await container.aget(Store)
-    items, total = store.get_exceptions(page=page)
-    total_pages = (total + 49) // 50
-    return await render_html(exceptions_page(items, page, total_pages))
+    items, cursor_prev, cursor_next = store.get_exceptions(after=after, before=before)
+    return await render_html(exceptions_page(items, cursor_prev, cursor_next))
 
 
 @router.get("/exceptions/{exc_id}")
@@ -65,3 +93,12 @@ async def exception_detail(container: DepContainer, exc_id: int):
     if not exc:
         return HTMLResponse("<h1>Exception not found</h1>", status_code=404)
     return await render_html(exception_detail_page(exc))
+
+
+@router.get("/exceptions/{exc_id}/tb.txt")
+async def exception_traceback(container: DepContainer, exc_id: int):
+    store = await container.aget(Store)
+    exc = store.get_exception(exc_id)
+    if not exc:
+        return PlainTextResponse("Exception not found", status_code=404)
+    return PlainTextResponse(exc.tb)
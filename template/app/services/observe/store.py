@@ -1,12 +1,28 @@
 # cuneus/ext/observability/store.py
 from __future__ import annotations
 
+import bisect
+import time
+from collections import deque
+from collections.abc import Iterator, Mapping
+from itertools import islice
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Protocol, runtime_checkable
 
+MESSAGE_PREVIEW_LENGTH = 60
+# How many traces/exceptions the dashboard lists
+RECENT_LIMIT = 10
+# Seconds a dashboard snapshot may be reused while new data is arriving
+DASHBOARD_STATS_TTL = 2.0
 
-@dataclass
+
+def ellipsize(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with an ellipsis."""
+    return text[:limit] + "…" if len(text) > limit else text
+
+
+@dataclass(slots=True)
 class TraceRecord:
     trace_id: str
     root_span_name: str
@@ -16,21 +32,25 @@ class TraceRecord:
     status: str  # OK, ERROR
 
 
-@dataclass
+@dataclass(slots=True)
 class SpanRecord:
     trace_id: str
     span_id: str
     parent_span_id: str | None
     name: str
     kind: str
-    started_at: datetime
+    started_ns: int  # epoch nanoseconds, as reported by OTEL
     duration_ms: int
     status: str
-    attributes: dict | None = None
+    attributes: Mapping | None = None
     events: list | None = None
 
+    @property
+    def started_at(self) -> datetime:
+        return datetime.fromtimestamp(self.started_ns / 1e9, tz=timezone.utc)
 
-@dataclass
+
+@dataclass(slots=True)
 class ExceptionRecord:
     id: int
     ts: datetime
@@ -41,9 +61,16 @@ class ExceptionRecord:
     message: str
     tb: str
     ctx: dict | None = None
+    # Truncated message for listings, computed once when the record is made
+    message_preview: str = field(init=False, default="")
+    # Indented ctx JSON for the detail page, filled on its first view
+    ctx_json: str | None = field(init=False, default=None)
 
+    def __post_init__(self) -> None:
+        self.message_preview = ellipsize(self.message, MESSAGE_PREVIEW_LENGTH)
 
-@dataclass
+
+@dataclass(slots=True)
 class DashboardStats:
     trace_count: int
     error_count: int
@@ -51,6 +78,13 @@ class DashboardStats:
     avg_duration_ms: float
     recent_traces: list[TraceRecord]
     recent_exceptions: list[ExceptionRecord]
+    # Display strings for the stat cards, formatted once per stats snapshot
+    error_rate_str: str = field(init=False, default="")
+    avg_duration_ms_str: str = field(init=False, default="")
+
+    def __post_init__(self) -> None:
+        self.error_rate_str = f"{self.error_rate:.1f}%"
+        self.avg_duration_ms_str = f"{self.avg_duration_ms:.0f}ms"
 
 
 @runtime_checkable
@@ -58,18 +92,26 @@ class Store(Protocol):
     """Protocol for observability storage."""
 
     def insert_trace(self, trace: TraceRecord) -> None: ...
+    def insert_traces(self, traces: list[TraceRecord]) -> None: ...
     def insert_span(self, span: SpanRecord) -> None: ...
+    def insert_spans(self, spans: list[SpanRecord]) -> None: ...
     def insert_exception(self, exc: ExceptionRecord) -> None: ...
 
+    # Listings are newest first and paged by keyset cursors: they return
+    # (items, cursor for the previous page, cursor for the next page).
     def get_traces(
-        self, page: int = 1, per_page: int = 50, status: str | None = None
-    ) -> tuple[list[TraceRecord], int]: ...
+        self,
+        after: str | None = None,
+        before: str | None = None,
+        per_page: int = 50,
+        status: str | None = None,
+    ) -> tuple[list[TraceRecord], str | None, str | None]: ...
     def get_trace(self, trace_id: str) -> TraceRecord | None: ...
     def get_spans_for_trace(self, trace_id: str) -> list[SpanRecord]: ...
 
     def get_exceptions(
-        self, page: int = 1, per_page: int = 50
-    ) -> tuple[list[ExceptionRecord], int]: ...
+        self, after: int | None = None, before: int | None = None, per_page: int = 50
+    ) -> tuple[list[ExceptionRecord], int | None, int | None]: ...
     def get_exception(self, exc_id: int) -> ExceptionRecord | None: ...
 
     def get_dashboard_stats(self) -> DashboardStats: ...
@@ -80,77 +122,190 @@ class InMemoryStore:
     """Simple in-memory store for development/testing."""
 
     traces: dict[str, TraceRecord] = field(default_factory=dict)
-    spans: list[SpanRecord] = field(default_factory=list)
+    spans_by_trace: dict[str, list[SpanRecord]] = field(default_factory=dict)
     exceptions: list[ExceptionRecord] = field(default_factory=list)
     _exc_id_counter: int = 0
+    _exceptions_by_id: dict[int, ExceptionRecord] = field(
+        default_factory=dict, repr=False
+    )
+    # Traces oldest first by (started_at, trace_id), for keyset paging
+    _trace_order: list[TraceRecord] = field(default_factory=list, repr=False)
+    # Exceptions oldest first by (ts, id), for keyset paging
+    _exception_order: list[ExceptionRecord] = field(default_factory=list, repr=False)
+    # Running dashboard figures, kept up to date by the insert methods
+    _error_count: int = field(default=0, repr=False)
+    _duration_sum: int = field(default=0, repr=False)
+    _recent_exceptions: deque[ExceptionRecord] = field(
+        default_factory=lambda: deque(maxlen=RECENT_LIMIT), repr=False
+    )
+    # (monotonic time built, snapshot); _stats_stale is set by inserts
+    _stats_cache: tuple[float, DashboardStats] | None = field(
+        default=None, repr=False
+    )
+    _stats_stale: bool = field(default=False, repr=False)
 
     def insert_trace(self, trace: TraceRecord) -> None:
+        previous = self.traces.get(trace.trace_id)
         self.traces[trace.trace_id] = trace
+        self._stats_stale = True
+        self._error_count += trace.status == "ERROR"
+        self._duration_sum += trace.duration_ms
+        if previous is None:
+            bisect.insort(self._trace_order, trace, key=_trace_sort_key)
+            return
+
+        # Re-export of a known trace: swap its contribution for the new one
+        del self._trace_order[self._trace_position(previous)]
+        bisect.insort(self._trace_order, trace, key=_trace_sort_key)
+        self._error_count -= previous.status == "ERROR"
+        self._duration_sum -= previous.duration_ms
+
+    def insert_traces(self, traces: list[TraceRecord]) -> None:
+        for trace in traces:
+            self.insert_trace(trace)
 
     def insert_span(self, span: SpanRecord) -> None:
-        self.spans.append(span)
+        self.spans_by_trace.setdefault(span.trace_id, []).append(span)
+
+    def insert_spans(self, spans: list[SpanRecord]) -> None:
+        by_trace = self.spans_by_trace
+        for span in spans:
+            by_trace.setdefault(span.trace_id, []).append(span)
 
     def insert_exception(self, exc: ExceptionRecord) -> None:
         self._exc_id_counter += 1
         exc.id = self._exc_id_counter
         self.exceptions.append(exc)
+        self._exceptions_by_id[exc.id] = exc
+        bisect.insort(self._exception_order, exc, key=_exception_sort_key)
+        self._recent_exceptions.appendleft(exc)
+        self._stats_stale = True
 
     def get_traces(
-        self, page: int = 1, per_page: int = 50, status: str | None = None
-    ) -> tuple[list[TraceRecord], int]:
-        traces = list(self.traces.values())
-        if status:
-            traces = [t for t in traces if t.status == status]
-        traces.sort(key=lambda t: t.started_at, reverse=True)
+        self,
+        after: str | None = None,
+        before: str | None = None,
+        per_page: int = 50,
+        status: str | None = None,
+    ) -> tuple[list[TraceRecord], str | None, str | None]:
+        page: list[TraceRecord] = []
+        if after in self.traces:
+            stop = self._trace_position(self.traces[after])
+            page = list(islice(self._traces_older(stop, status), per_page))
+        else:
+            if before in self.traces:
+                start = self._trace_position(self.traces[before]) + 1
+                page = list(islice(self._traces_newer(start, status), per_page))
+                page.reverse()
+            if len(page) < per_page:
+                # No cursor, or too few newer traces left: show the first page
+                stop = len(self._trace_order)
+                page = list(islice(self._traces_older(stop, status), per_page))
+        if not page:
+            return page, None, None
+
+        newest = self._trace_position(page[0])
+        oldest = self._trace_position(page[-1])
+        has_newer = next(self._traces_newer(newest + 1, status), None) is not None
+        has_older = next(self._traces_older(oldest, status), None) is not None
+        return (
+            page,
+            page[0].trace_id if has_newer else None,
+            page[-1].trace_id if has_older else None,
+        )
+
+    def _trace_position(self, trace: TraceRecord) -> int:
+        return bisect.bisect_left(
+            self._trace_order, _trace_sort_key(trace), key=_trace_sort_key
+        )
 
-        total = len(traces)
-        start = (page - 1) * per_page
-        end = start + per_page
+    def _traces_older(self, stop: int, status: str | None) -> Iterator[TraceRecord]:
+        """Traces before position stop, newest first."""
+        order = self._trace_order
+        for i in range(stop - 1, -1, -1):
+            if not status or order[i].status == status:
+                yield order[i]
 
-        return traces[start:end], total
+    def _traces_newer(self, start: int, status: str | None) -> Iterator[TraceRecord]:
+        """Traces from position start on, oldest first."""
+        order = self._trace_order
+        for i in range(start, len(order)):
+            if not status or order[i].status == status:
+                yield order[i]
 
     def get_trace(self, trace_id: str) -> TraceRecord | None:
         return self.traces.get(trace_id)
 
     def get_spans_for_trace(self, trace_id: str) -> list[SpanRecord]:
-        spans = [s for s in self.spans if s.trace_id == trace_id]
-        spans.sort(key=lambda s: s.started_at)
-        return spans
+        return sorted(
+            self.spans_by_trace.get(trace_id, ()), key=lambda s: s.started_ns
+        )
 
     def get_exceptions(
-        self, page: int = 1, per_page: int = 50
-    ) -> tuple[list[ExceptionRecord], int]:
-        exceptions = sorted(self.exceptions, key=lambda e: e.ts, reverse=True)
-        total = len(exceptions)
-        start = (page - 1) * per_page
-        end = start + per_page
-        return exceptions[start:end], total
+        self, after: int | None = None, before: int | None = None, per_page: int = 50
+    ) -> tuple[list[ExceptionRecord], int | None, int | None]:
+        order = self._exception_order
+        if after in self._exceptions_by_id:
+            end = self._exception_position(self._exceptions_by_id[after])
+            start = max(end - per_page, 0)
+        elif before in self._exceptions_by_id:
+            start = self._exception_position(self._exceptions_by_id[before]) + 1
+            end = min(start + per_page, len(order))
+        else:
+            # No cursor, or an unknown one: the first page
+            end = len(order)
+            start = max(end - per_page, 0)
+        page = order[start:end]
+        if not page:
+            return page, None, None
+
+        page.reverse()
+        return (
+            page,
+            page[0].id if end < len(order) else None,
+            page[-1].id if start > 0 else None,
+        )
+
+    def _exception_position(self, exc: ExceptionRecord) -> int:
+        return bisect.bisect_left(
+            self._exception_order, _exception_sort_key(exc), key=_exception_sort_key
+        )
 
     def get_exception(self, exc_id: int) -> ExceptionRecord | None:
-        for exc in self.exceptions:
-            if exc.id == exc_id:
-                return exc
-        return None
+        return self._exceptions_by_id.get(exc_id)
 
     def get_dashboard_stats(self) -> DashboardStats:
-        traces = list(self.traces.values())
-        trace_count = len(traces)
-        error_count = sum(1 for t in traces if t.status == "ERROR")
-        error_rate = (error_count / trace_count * 100) if trace_count else 0
-        avg_duration = (
-            sum(t.duration_ms for t in traces) / trace_count if trace_count else 0
-        )
+        # Reuse the snapshot if nothing changed, or if it is under the TTL
+        # old, so bursts of viewers under steady traffic share one build.
+        now = time.monotonic()
+        if self._stats_cache is not None:
+            built_at, stats = self._stats_cache
+            if not self._stats_stale or now - built_at < DASHBOARD_STATS_TTL:
+                return stats
 
-        recent_traces = sorted(traces, key=lambda t: t.started_at, reverse=True)[:10]
-        recent_exceptions = sorted(self.exceptions, key=lambda e: e.ts, reverse=True)[
-            :10
-        ]
+        trace_count = len(self.traces)
+        error_count = self._error_count
+        error_rate = (error_count / trace_count * 100) if trace_count else 0
+        avg_duration = self._duration_sum / trace_count if trace_count else 0
 
-        return DashboardStats(
+        # Recent traces are newest started first, matching the first
+        # /traces page; recent exceptions are in export order
+        stats = DashboardStats(
             trace_count=trace_count,
             error_count=error_count,
             error_rate=error_rate,
             avg_duration_ms=avg_duration,
-            recent_traces=recent_traces,
-            recent_exceptions=recent_exceptions,
+            recent_traces=list(islice(reversed(self._trace_order), RECENT_LIMIT)),
+            recent_exceptions=list(self._recent_exceptions),
         )
+        self._stats_cache = (now, stats)
+        self._stats_stale = False
+        return stats
+
+
+def _trace_sort_key(trace: TraceRecord) -> tuple[datetime, str]:
+    return trace.started_at, trace.trace_id
+
+
+def _exception_sort_key(exc: ExceptionRecord) -> tuple[datetime, int]:
+    return exc.ts, exc.id
@@ -1,5 +1,6 @@
 """Protocol interfaces for htmpl services."""
 
+from collections.abc import Iterable
 from typing import Protocol
 
 
@@ -14,11 +15,19 @@ class TComponentGraph(Protocol):
         """Get all transitive htmpl dependencies for a URI."""
         ...
 
+    def get_dependents(self, uri: str) -> set[str]:
+        """Get all URIs that transitively depend on a URI."""
+        ...
+
     def get_python_deps(self, uri: str) -> set[str]:
         """Get Python package dependencies for a URI and its transitive deps."""
         ...
 
-    def get_installed(self) -> set[str]:
+    def get_python_deps_bulk(self, uris: Iterable[str]) -> set[str]:
+        """Get Python package dependencies for several URIs and their deps."""
+        ...
+
+    def get_installed(self) -> frozenset[str]:
         """Get URIs of all installed components."""
         ...
 
@@ -45,5 +54,8 @@ class TComponentGraph(Protocol):
         ...
 
     def all_components(self) -> list[dict]:
-        """Return metadata for all htmpl components."""
+        """Return metadata for all htmpl components.
+
+        The list may be cached and shared between callers, do not modify it.
+        """
         ...
@@ -0,0 +1,99 @@
+"""Tests for the release build script."""
+
+import pytest
+from pathlib import Path
+
+from build_release import build_ttl, ttl_source_key
+
+
+@pytest.fixture
+def template_dir(tmp_path: Path) -> Path:
+    """A template with one component, and no components.ttl yet."""
+    component = tmp_path / "template" / "app" / "services" / "redis"
+    component.mkdir(parents=True)
+    (component / "component.toml").write_text(
+        """\
+[project]
+name = "redis"
+uri = "services/redis"
+readme = "README.md"
+"""
+    )
+    (component / "README.md").write_text("# Redis\n")
+    return tmp_path / "template"
+
+
+class TestBuildTTL:
+    """Tests for skipping TTL builds when sources are unchanged."""
+
+    def test_second_build_is_a_no_op(
+        self, template_dir: Path, capsys: pytest.CaptureFixture[str]
+    ):
+        # Default output location, inside the services tree that gets hashed
+        output = template_dir / "app" / "services" / "htmpl_admin" / "components.ttl"
+        build_ttl(template_dir, output)
+        written = output.stat().st_mtime_ns
+        capsys.readouterr()
+
+        build_ttl(template_dir, output)
+
+        assert "Up to date" in capsys.readouterr().out
+        assert output.stat().st_mtime_ns == written
+
+    def test_source_change_rebuilds(
+        self, template_dir: Path, capsys: pytest.CaptureFixture[str]
+    ):
+        output = template_dir / "app" / "services" / "htmpl_admin" / "components.ttl"
+        build_ttl(template_dir, output)
+        key = ttl_source_key(template_dir)
+
+        toml = template_dir / "app" / "services" / "redis" / "component.toml"
+        toml.write_text(toml.read_text() + 'help = "Cache"\n')
+        capsys.readouterr()
+        build_ttl(template_dir, output)
+
+        assert ttl_source_key(template_dir) != key
+        assert "Generated" in capsys.readouterr().out
+        assert 'htmpl:help "Cache"' in output.read_text()
+
+    def test_force_rebuilds(self, template_dir: Path, capsys: pytest.CaptureFixture[str]):
+        output = template_dir / "app" / "services" / "htmpl_admin" / "components.ttl"
+        build_ttl(template_dir, output)
+        capsys.readouterr()
+
+        build_ttl(template_dir, output, force=True)
+
+        assert "Generated" in capsys.readouterr().out
+
+    def test_readme_change_rebuilds(self, template_dir: Path):
+        key = ttl_source_key(template_dir)
+
+        (template_dir / "app" / "services" / "redis" / "README.md").write_text(
+            "# Redis\n\nCache and queues.\n"
+        )
+
+        assert ttl_source_key(template_dir) != key
+
+    def test_unrelated_files_do_not_rebuild(self, template_dir: Path):
+        key = ttl_source_key(template_dir)
+
+        component = template_dir / "app" / "services" / "redis"
+        (component / "routes.py").write_text("router = None\n")
+        (component / "__pycache__").mkdir()
+        (component / "__pycache__" / "routes.cpython-314.pyc").write_bytes(b"\0")
+
+        assert ttl_source_key(template_dir) == key
+
+    def test_follows_symlinked_components(self, template_dir: Path, tmp_path: Path):
+        # Same layout as rendered/, every component is a link into template/
+        linked = tmp_path / "rendered"
+        (linked / "app" / "services").mkdir(parents=True)
+        (linked / "app" / "services" / "redis").symlink_to(
+            template_dir / "app" / "services" / "redis"
+        )
+        key = ttl_source_key(linked)
+
+        toml = template_dir / "app" / "services" / "redis" / "component.toml"
+        toml.write_text(toml.read_text() + 'help = "Cache"\n')
+
+        assert ttl_source_key(linked) != key
@@ -1,13 +1,21 @@
 """Tests for component graph service."""
 
+import base64
+import gzip
+import shutil
+
 import pytest
 from pathlib import Path
-from textwrap import dedent
+
+from rdflib import Graph, Literal, URIRef
 
 from rendered.services.htmpl_admin.graph import (
+    DEP,
+    HTMPL,
     build_component_ttl,
     ComponentGraph,
     extract_config_key,
+    parse_component_ttl,
 )
 
 
@@ -30,179 +38,309 @@ class TestExtractConfigKey:
         assert extract_config_key("auth") is None
 
 
-@pytest.fixture
-def template_dir(tmp_path: Path) -> Path:
-    """Create a sample template structure for testing."""
-    # Mimic copier template structure: template/{{name}}/{{module}}/...
-    module = tmp_path / "template" / "{{name}}" / "{{module}}"
-    components = module / "components"
-    services = module / "services"
-    components.mkdir(parents=True)
-    services.mkdir(parents=True)
-
+AUTH_TOML = """\
+[project]
+name = "auth"
+uri = "components/auth"
+description = "Authentication components"
+readme = "README.md"
+help = "Login and registration forms"
+dependencies = ["htmpl:services/oauth", "python:pyjwt>=2.8.0"]
+"""
+
+AUTH_README = """\
+# Auth Component
+
+Provides login and registration.
+
+```python
+from auth import login
+```
+"""
+
+FORMS_TOML = """\
+[project]
+name = "forms"
+uri = "components/forms"
+description = "Form components"
+"""
+
+OAUTH_TOML = """\
+[project]
+name = "oauth"
+uri = "services/oauth"
+description = "OAuth2 service"
+help = "Provides OAuth2 authentication"
+dependencies = ["htmpl:services/redis", "python:authlib>=1.0"]
+"""
+
+REDIS_TOML = """\
+[project]
+name = "redis"
+uri = "services/redis"
+description = "Redis service"
+"""
+
+AUTH_README_ENCODED = base64.b64encode(
+    gzip.compress(AUTH_README.encode(), mtime=0)
+).decode()
+
+AUTH = URIRef("htmpl://components/auth")
+FORMS = URIRef("htmpl://components/forms")
+OAUTH = URIRef("htmpl://services/oauth")
+REDIS = URIRef("htmpl://services/redis")
+
+# What build_component_ttl emits for the sample template, so graph tests
+# don't depend on the builder. test_matches_sample_ttl keeps the two in sync.
+SAMPLE_TTL = f"""\
+@prefix htmpl: <htmpl://> .
+@prefix dep: <htmpl://depends/> .
+
+<htmpl://components/auth> htmpl:name "auth" .
+<htmpl://components/auth> htmpl:configKey "auth" .
+<htmpl://components/auth> dep:requires <htmpl://services/oauth> .
+<htmpl://components/auth> dep:python "pyjwt>=2.8.0" .
+<htmpl://components/auth> htmpl:help "Login and registration forms" .
+<htmpl://components/auth> htmpl:readme "{AUTH_README_ENCODED}" .
+
+<htmpl://components/forms> htmpl:name "forms" .
+
+<htmpl://services/oauth> htmpl:name "oauth" .
+<htmpl://services/oauth> htmpl:configKey "oauth" .
+<htmpl://services/oauth> dep:requires <htmpl://services/redis> .
+<htmpl://services/oauth> dep:python "authlib>=1.0" .
+<htmpl://services/oauth> htmpl:help "Provides OAuth2 authentication" .
+
+<htmpl://services/redis> htmpl:name "redis" .
+"""
+
+
+# Sample template files, relative to template/app
+LAYOUT = [
     # Auth component with conditional directory name
-    auth = components / "{% if auth %}auth{% endif %}"
-    auth.mkdir()
-    (auth / "component.toml").write_text(
-        dedent(
-            """
-        [project]
-        name = "auth"
-        uri = "components/auth"
-        description = "Authentication components"
-        readme = "README.md"
-        help = "Login and registration forms"
-        dependencies = ["htmpl:services/oauth", "python:pyjwt>=2.8.0"]
-    """
-        ).strip()
-    )
-    (auth / "README.md").write_text(
-        dedent(
-            """
-        # Auth Component
-
-        Provides login and registration.
-
-        ```python
-        from auth import login
-        ```
-    """
-        ).strip()
-    )
-
+    ("components/{% if auth %}auth{% endif %}/component.toml", AUTH_TOML),
+    ("components/{% if auth %}auth{% endif %}/README.md", AUTH_README),
     # Forms component (always included, no conditional)
-    forms = components / "forms"
-    forms.mkdir()
-    (forms / "component.toml").write_text(
-        dedent(
-            """
-        [project]
-        name = "forms"
-        uri = "components/forms"
-        description = "Form components"
-    """
-        ).strip()
-    )
-
+    ("components/forms/component.toml", FORMS_TOML),
     # OAuth service with conditional
-    oauth = services / "{% if oauth %}oauth{% endif %}"
-    oauth.mkdir()
-    (oauth / "component.toml").write_text(
-        dedent(
-            """
-        [project]
-        name = "oauth"
-        uri = "services/oauth"
-        description = "OAuth2 service"
-        help = "Provides OAuth2 authentication"
-        dependencies = ["htmpl:services/redis", "python:authlib>=1.0"]
-    """
-        ).strip()
-    )
-
+    ("services/{% if oauth %}oauth{% endif %}/component.toml", OAUTH_TOML),
     # Redis service (always included)
-    redis = services / "redis"
-    redis.mkdir()
-    (redis / "component.toml").write_text(
-        dedent(
-            """
-        [project]
-        name = "redis"
-        uri = "services/redis"
-        description = "Redis service"
+    ("services/redis/component.toml", REDIS_TOML),
+]
+
+
+@pytest.fixture(scope="module")
+def template_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a sample template structure for testing.
+
+    Module scoped, tests must treat it as read-only.
     """
-        ).strip()
-    )
+    # Mimic copier template structure: template/app/...
+    root = tmp_path_factory.mktemp("tmpl")
+    module = root / "template" / "app"
+    for rel, content in LAYOUT:
+        path = module / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
 
-    return tmp_path / "template"
+    return root / "template"
 
 
-@pytest.fixture
-def ttl_file(template_dir: Path, tmp_path: Path) -> Path:
-    """Generate TTL file from template."""
-    ttl_content = build_component_ttl(template_dir)
-    ttl_path = tmp_path / "project" / "components.ttl"
-    ttl_path.parent.mkdir(parents=True, exist_ok=True)
-    ttl_path.write_text(ttl_content)
+@pytest.fixture(scope="module")
+def ttl(template_dir: Path) -> str:
+    """TTL generated from the sample template, built once per module."""
+    return build_component_ttl(template_dir)
+
+
+@pytest.fixture(scope="module")
+def parsed_ttl(ttl: str) -> Graph:
+    """The generated TTL parsed once, for triple lookups."""
+    return Graph().parse(data=ttl, format="turtle")
+
+
+@pytest.fixture(scope="module")
+def sample_ttl_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """SAMPLE_TTL written to disk once per module."""
+    ttl_path = tmp_path_factory.mktemp("ttl") / "components.ttl"
+    ttl_path.write_text(SAMPLE_TTL)
     return ttl_path
 
 
 @pytest.fixture
-def project_dir(ttl_file: Path) -> Path:
-    """Project directory containing components.ttl."""
-    return ttl_file.parent
+def project_dir(sample_ttl_file: Path, tmp_path: Path) -> Path:
+    """Project directory containing components.ttl.
+
+    Fresh for each test, since some tests install components into it.
+    """
+    project = tmp_path / "project"
+    project.mkdir()
+    shutil.copyfile(sample_ttl_file, project / "components.ttl")
+    return project
+
+
+@pytest.fixture(scope="module")
+def component_graph(
+    sample_ttl_file: Path, tmp_path_factory: pytest.TempPathFactory
+) -> ComponentGraph:
+    """One graph shared by read-only tests.
+
+    Tests that install components must build their own from project_dir.
+    """
+    project = tmp_path_factory.mktemp("project")
+    shutil.copyfile(sample_ttl_file, project / "components.ttl")
+    return ComponentGraph(project / "components.ttl", project_dir=project)
 
 
 class TestBuildComponentTTL:
     """Tests for TTL generation from template directory."""
 
-    def test_generates_valid_prefixes(self, template_dir: Path):
-        ttl = build_component_ttl(template_dir)
+    def test_generates_valid_prefixes(self, ttl: str):
         assert "@prefix htmpl: <htmpl://> ." in ttl
         assert "@prefix dep: <htmpl://depends/> ." in ttl
 
-    def test_includes_component_name(self, template_dir: Path):
-        ttl = build_component_ttl(template_dir)
-        assert '<htmpl://components/auth> htmpl:name "auth"' in ttl
+    def test_includes_component_name(self, parsed_ttl: Graph):
+        assert (AUTH, HTMPL.name, Literal("auth")) in parsed_ttl
 
-    def test_includes_config_key_for_conditionals(self, template_dir: Path):
-        ttl = build_component_ttl(template_dir)
-        assert '<htmpl://components/auth> htmpl:configKey "auth"' in ttl
-        assert '<htmpl://services/oauth> htmpl:configKey "oauth"' in ttl
+    def test_includes_config_key_for_conditionals(self, parsed_ttl: Graph):
+        assert (AUTH, HTMPL.configKey, Literal("auth")) in parsed_ttl
+        assert (OAUTH, HTMPL.configKey, Literal("oauth")) in parsed_ttl
 
-    def test_no_config_key_for_always_included(self, template_dir: Path):
-        ttl = build_component_ttl(template_dir)
+    def test_no_config_key_for_always_included(self, parsed_ttl: Graph):
         # forms and redis don't have conditionals
-        assert "<htmpl://components/forms> htmpl:configKey" not in ttl
-        assert "<htmpl://services/redis> htmpl:configKey" not in ttl
-
-    def test_includes_dependencies(self, template_dir: Path):
-        ttl = build_component_ttl(template_dir)
-        assert "<htmpl://components/auth> dep:requires <htmpl://services/oauth>" in ttl
-        assert '<htmpl://components/auth> dep:python "pyjwt>=2.8.0"' in ttl
-
-    def test_includes_help_text(self, template_dir: Path):
-        ttl = build_component_ttl(template_dir)
-        assert (
-            '<htmpl://components/auth> htmpl:help "Login and registration forms"' in ttl
-        )
+        assert set(parsed_ttl.subjects(HTMPL.configKey)) == {AUTH, OAUTH}
+
+    def test_includes_dependencies(self, parsed_ttl: Graph):
+        assert (AUTH, DEP.requires, OAUTH) in parsed_ttl
+        assert (AUTH, DEP.python, Literal("pyjwt>=2.8.0")) in parsed_ttl
 
-    def test_includes_readme_base64(self, template_dir: Path):
-        ttl = build_component_ttl(template_dir)
-        # README should be base64 encoded
-        assert '<htmpl://components/auth> htmpl:readme "' in ttl
+    def test_includes_help_text(self, parsed_ttl: Graph):
+        assert (AUTH, HTMPL.help, Literal("Login and registration forms")) in parsed_ttl
+
+    def test_includes_readme_base64(self, ttl: str, parsed_ttl: Graph):
+        # README should be gzipped and base64 encoded
+        encoded = parsed_ttl.value(AUTH, HTMPL.readme)
+        assert gzip.decompress(base64.b64decode(str(encoded))).decode() == AUTH_README
         # Should not contain raw markdown
         assert "# Auth Component" not in ttl
 
+    def test_matches_sample_ttl(self, parsed_ttl: Graph):
+        # READMEs are gzipped with a timestamp, compare everything else
+        sample = Graph().parse(data=SAMPLE_TTL, format="turtle")
+        assert {t for t in parsed_ttl if t[1] != HTMPL.readme} == {
+            t for t in sample if t[1] != HTMPL.readme
+        }
+
+    def test_escapes_literals(self, tmp_path: Path):
+        component = tmp_path / "template" / "app" / "components" / "quoted"
+        component.mkdir(parents=True)
+        (component / "component.toml").write_text(
+            r"""[project]
+name = "quoted"
+uri = "components/quoted"
+help = "Say \"hi\" with a \\ backslash"
+"""
+        )
+        ttl = build_component_ttl(tmp_path / "template")
+
+        graph = Graph().parse(data=ttl, format="turtle")
+        help_text = graph.value(URIRef("htmpl://components/quoted"), HTMPL.help)
+        assert str(help_text) == 'Say "hi" with a \\ backslash'
+
+    def test_reencodes_changed_readme(self, tmp_path: Path):
+        component = tmp_path / "template" / "app" / "components" / "docs"
+        component.mkdir(parents=True)
+        (component / "component.toml").write_text(
+            """[project]
+name = "docs"
+uri = "components/docs"
+readme = "README.md"
+"""
+        )
+        readme = component / "README.md"
+        readme.write_text("# First")
+        build_component_ttl(tmp_path / "template")
+        readme.write_text("# Second, longer")
+
+        graph = Graph().parse(data=build_component_ttl(tmp_path / "template"), format="turtle")
+        encoded = graph.value(URIRef("htmpl://components/docs"), HTMPL.readme)
+        assert gzip.decompress(base64.b64decode(str(encoded))) == b"# Second, longer"
+
     def test_handles_empty_template(self, tmp_path: Path):
         empty = tmp_path / "empty_template"
         empty.mkdir()
         ttl = build_component_ttl(empty)
         lines = [l for l in ttl.strip().split("\n") if l]
-        assert len(lines) == 3  # Just the prefixes
+        assert len(lines) == 2  # Just the prefixes
+
+
+class TestParseComponentTTL:
+    """Tests for the fast path TTL reader."""
+
+    def test_matches_rdflib(self):
+        ttl = r"""@prefix htmpl: <htmpl://> .
+@prefix dep: <htmpl://depends/> .
+
+<htmpl://components/auth> htmpl:name "auth" .
+<htmpl://components/auth> dep:requires <htmpl://services/oauth> .
+<htmpl://components/auth> htmpl:help "Say \"hi\" \\ bye" .
+"""
+        triples = parse_component_ttl(ttl)
+        assert triples is not None
+        assert set(triples) == set(Graph().parse(data=ttl, format="turtle"))
+
+    @pytest.mark.parametrize("escape", [r"\u00e9", r"\U000000e9", r"\b", r"\f"])
+    def test_other_escapes_return_none(self, escape: str):
+        ttl = f'@prefix htmpl: <htmpl://> .\n<htmpl://a> htmpl:help "caf{escape}" .'
+        assert parse_component_ttl(ttl) is None
+
+    def test_escaped_backslash_before_a_letter(self):
+        ttl = r"""@prefix htmpl: <htmpl://> .
+<htmpl://a> htmpl:help "C:\\users\tdir" ."""
+        triples = parse_component_ttl(ttl)
+        assert triples is not None
+        assert set(triples) == set(Graph().parse(data=ttl, format="turtle"))
+
+    def test_graph_falls_back_to_rdflib(self, tmp_path: Path):
+        ttl_path = tmp_path / "components.ttl"
+        ttl_path.write_text(
+            r"""@prefix htmpl: <htmpl://> .
+@prefix dep: <htmpl://depends/> .
+<htmpl://components/cafe> htmpl:name "caf\u00e9" .
+<htmpl://components/cafe> dep:requires <htmpl://services/redis> .
+"""
+        )
+        graph = ComponentGraph(ttl_path, project_dir=tmp_path)
+
+        assert graph.get_component("components/cafe")["name"] == "café"
+
+    def test_unknown_shape_returns_none(self):
+        ttl = '@prefix htmpl: <htmpl://> .\n<htmpl://a> htmpl:name "a" ; htmpl:help "b" .'
+        assert parse_component_ttl(ttl) is None
 
 
 class TestComponentGraph:
     """Tests for the ComponentGraph class."""
 
-    def test_loads_ttl_file(self, project_dir: Path):
-        graph = ComponentGraph(project_dir=project_dir)
-        assert graph.graph is not None
+    def test_loads_ttl_file(self, component_graph: ComponentGraph):
+        assert component_graph.graph is not None
 
-    def test_get_deps_returns_transitive_dependencies(self, project_dir: Path):
-        graph = ComponentGraph(project_dir=project_dir)
-        deps = graph.get_deps("components/auth")
+    def test_get_deps_returns_transitive_dependencies(
+        self, component_graph: ComponentGraph
+    ):
+        deps = component_graph.get_deps("components/auth")
         assert "services/oauth" in deps
         assert "services/redis" in deps  # Transitive through oauth
 
-    def test_get_deps_empty_for_leaf(self, project_dir: Path):
-        graph = ComponentGraph(project_dir=project_dir)
-        deps = graph.get_deps("services/redis")
+    def test_get_deps_empty_for_leaf(self, component_graph: ComponentGraph):
+        deps = component_graph.get_deps("services/redis")
         assert deps == set()
 
-    def test_get_python_deps(self, project_dir: Path):
-        graph = ComponentGraph(project_dir=project_dir)
-        deps = graph.get_python_deps("components/auth")
+    def test_get_dependents(self, component_graph: ComponentGraph):
+        dependents = component_graph.get_dependents("services/oauth")
+        assert dependents == {"components/auth"}
+
+    def test_get_python_deps(self, component_graph: ComponentGraph):
+        deps = component_graph.get_python_deps("components/auth")
         assert "pyjwt>=2.8.0" in deps
         # Transitive: auth -> oauth -> authlib
         assert "authlib>=1.0" in deps
@@ -210,23 +348,58 @@ class TestComponentGraph:
     def test_detects_installed_components(self, project_dir: Path):
         (project_dir / "components" / "auth").mkdir(parents=True)
 
-        graph = ComponentGraph(project_dir=project_dir)
+        graph = ComponentGraph(project_dir / "components.ttl", project_dir=project_dir)
         installed = graph.get_installed()
         assert "components/auth" in installed
 
     def test_resolve_excludes_installed(self, project_dir: Path):
         (project_dir / "services" / "redis").mkdir(parents=True)
 
-        graph = ComponentGraph(project_dir=project_dir)
+        graph = ComponentGraph(project_dir / "components.ttl", project_dir=project_dir)
         needed = graph.resolve(["components/auth"])
 
         assert "services/redis" not in needed  # Already installed
         assert "services/oauth" in needed
         assert "components/auth" in needed
 
-    def test_get_config_keys(self, project_dir: Path):
-        graph = ComponentGraph(project_dir=project_dir)
-        keys = graph.get_config_keys(
+    def test_refresh_installed_picks_up_new_component(self, project_dir: Path):
+        (project_dir / "services" / "redis").mkdir(parents=True)
+        graph = ComponentGraph(project_dir / "components.ttl", project_dir=project_dir)
+        assert graph.get_installed() == {"services/redis"}
+
+        (project_dir / "components" / "auth").mkdir(parents=True)
+        (project_dir / "services" / "oauth").mkdir()
+        graph.refresh_installed()
+
+        assert graph.get_installed() == {"components/auth", "services/oauth", "services/redis"}
+        assert graph.get_component("components/auth")["installed"] is True
+
+    def test_installed_set_is_read_only(self, component_graph: ComponentGraph):
+        installed = component_graph.get_installed()
+
+        assert isinstance(installed, frozenset)
+        with pytest.raises(AttributeError):
+            installed.add("components/forms")  # type: ignore[attr-defined]
+
+    def test_refresh_installed_picks_up_removal(self, project_dir: Path):
+        (project_dir / "services" / "redis").mkdir(parents=True)
+        graph = ComponentGraph(project_dir / "components.ttl", project_dir=project_dir)
+
+        (project_dir / "services" / "redis").rmdir()
+        graph.refresh_installed()
+
+        assert graph.get_installed() == set()
+
+    def test_refresh_installed_keeps_cache_when_unchanged(self, project_dir: Path):
+        graph = ComponentGraph(project_dir / "components.ttl", project_dir=project_dir)
+        components = graph.all_components()
+
+        graph.refresh_installed()
+
+        assert graph.all_components() is components
+
+    def test_get_config_keys(self, component_graph: ComponentGraph):
+        keys = component_graph.get_config_keys(
             ["components/auth", "services/oauth", "services/redis"]
         )
 
@@ -240,73 +413,68 @@ class TestComponentGraph:
     def test_all_components_returns_metadata(self, project_dir: Path):
         (project_dir / "components" / "auth").mkdir(parents=True)
 
-        graph = ComponentGraph(project_dir=project_dir)
-        components = graph.all_components()
+        graph = ComponentGraph(project_dir / "components.ttl", project_dir=project_dir)
+        by_uri = {c["uri"]: c for c in graph.all_components()}
 
-        auth = next(c for c in components if c["uri"] == "components/auth")
+        auth = by_uri["components/auth"]
         assert auth["name"] == "auth"
         assert auth["config_key"] == "auth"
         assert auth["installed"] is True
         assert auth["help"] == "Login and registration forms"
 
-        redis = next(c for c in components if c["uri"] == "services/redis")
+        redis = by_uri["services/redis"]
         assert redis["config_key"] is None  # Always included
 
-    def test_get_component(self, project_dir: Path):
-        graph = ComponentGraph(project_dir=project_dir)
-        component = graph.get_component("components/auth")
+    def test_get_component(self, component_graph: ComponentGraph):
+        component = component_graph.get_component("components/auth")
 
         assert component is not None
         assert component["name"] == "auth"
         assert component["uri"] == "components/auth"
         assert component["config_key"] == "auth"
 
-    def test_get_component_not_found(self, project_dir: Path):
-        graph = ComponentGraph(project_dir=project_dir)
-        component = graph.get_component("components/nonexistent")
+    def test_get_component_not_found(self, component_graph: ComponentGraph):
+        component = component_graph.get_component("components/nonexistent")
         assert component is None
 
-    def test_get_readme(self, project_dir: Path):
-        graph = ComponentGraph(project_dir=project_dir)
-        readme = graph.get_readme("components/auth")
+    def test_get_readme(self, component_graph: ComponentGraph):
+        readme = component_graph.get_readme("components/auth")
 
         assert readme is not None
         assert "# Auth Component" in readme
         assert "```python" in readme
 
-    def test_get_readme_not_found(self, project_dir: Path):
-        graph = ComponentGraph(project_dir=project_dir)
-        readme = graph.get_readme("components/forms")
+    def test_get_readme_not_found(self, component_graph: ComponentGraph):
+        readme = component_graph.get_readme("components/forms")
         assert readme is None
 
 
+REAL_TEMPLATE = Path(__file__).parent.parent / "template"
+
+
+@pytest.fixture(scope="module")
+def real_ttl(tmp_path_factory: pytest.TempPathFactory) -> tuple[str, Path]:
+    """TTL built once from the actual template, and a file holding it."""
+    ttl = build_component_ttl(REAL_TEMPLATE)
+    ttl_path = tmp_path_factory.mktemp("real") / "components.ttl"
+    ttl_path.write_text(ttl)
+    return ttl, ttl_path
+
+
+@pytest.mark.skipif(not REAL_TEMPLATE.exists(), reason="template/ directory not found")
 class TestRealTemplate:
     """Integration tests against the actual template directory."""
 
-    @pytest.fixture
-    def real_template(self) -> Path:
-        """Path to the actual template directory."""
-        template = Path(__file__).parent.parent / "template"
-        if not template.exists():
-            pytest.skip("template/ directory not found")
-        return template
-
-    def test_can_build_ttl_from_template(self, real_template: Path):
+    def test_can_build_ttl_from_template(self, real_ttl: tuple[str, Path]):
         """Verify TTL generation works with real template."""
-        ttl = build_component_ttl(real_template)
+        ttl, _ = real_ttl
         assert "@prefix htmpl:" in ttl
 
-    def test_auth_component_has_config_key(self, real_template: Path, tmp_path: Path):
+    def test_auth_component_has_config_key(self, real_ttl: tuple[str, Path]):
         """Verify auth component is correctly parsed."""
-        ttl = build_component_ttl(real_template)
-        ttl_path = tmp_path / "components.ttl"
-        ttl_path.write_text(ttl)
-
+        _, ttl_path = real_ttl
         graph = ComponentGraph(components_ttl=ttl_path)
-        components = graph.all_components()
+        by_uri = {c["uri"]: c for c in graph.all_components()}
 
-        # Find auth if it exists
-        auth_components = [c for c in components if "auth" in c["uri"]]
-        if auth_components:
-            auth = auth_components[0]
-            assert auth["config_key"] is not None
+        assert "components/auth" in by_uri
+        assert by_uri["components/auth"]["config_key"] == "auth"
@@ -0,0 +1,316 @@
+"""Tests for the observability store and pages."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from tdom import html
+
+from rendered.services.observe.pages import exception_detail_page, traces_page_stream
+from rendered.services.observe.store import (
+    DASHBOARD_STATS_TTL,
+    RECENT_LIMIT,
+    ExceptionRecord,
+    InMemoryStore,
+    TraceRecord,
+)
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_trace(n: int, status: str = "OK", duration_ms: int = 10) -> TraceRecord:
+    """Trace number n, started n seconds after START."""
+    return TraceRecord(
+        trace_id=f"{n:032x}",
+        root_span_name=f"GET /{n}",
+        service="app",
+        started_at=START + timedelta(seconds=n),
+        duration_ms=duration_ms,
+        status=status,
+    )
+
+
+def make_exception(n: int, ctx: dict | None = None) -> ExceptionRecord:
+    """Exception number n, raised n seconds after START."""
+    return ExceptionRecord(
+        id=0,  # assigned by the store
+        ts=START + timedelta(seconds=n),
+        trace_id=None,
+        span_id=None,
+        fingerprint=f"fp{n}",
+        exc_type="ValueError",
+        message=f"bad value {n}",
+        tb="Traceback (most recent call last): ...",
+        ctx=ctx,
+    )
+
+
+def ids(records: list[TraceRecord]) -> list[str]:
+    return [r.trace_id for r in records]
+
+
+@pytest.fixture
+def store() -> InMemoryStore:
+    """Five traces, exported out of start order; the even ones failed."""
+    store = InMemoryStore()
+    store.insert_traces(
+        [make_trace(n, status="ERROR" if n % 2 == 0 else "OK") for n in (3, 1, 5, 2, 4)]
+    )
+    return store
+
+
+class TestTracesPageStream:
+    """Tests for the streamed traces listing."""
+
+    def test_empty_listing_is_one_chunk(self):
+        chunks = list(traces_page_stream([], None, None, None))
+
+        assert len(chunks) == 1
+        assert isinstance(chunks[0], str)
+        assert "No traces" in chunks[0]
+
+    def test_streams_a_chunk_per_row(self):
+        traces = [make_trace(2), make_trace(1, status="ERROR")]
+        chunks = list(traces_page_stream(traces, None, traces[-1].trace_id, None))
+
+        assert all(isinstance(chunk, str) for chunk in chunks)
+        # Page head, one chunk per row, page tail
+        assert len(chunks) == len(traces) + 2
+        assert "GET /2" in chunks[1]
+        assert "GET /1" in chunks[2]
+        page = "".join(chunks)
+        assert "<!--rows-->" not in page
+        assert "No traces" not in page
+        assert page.rstrip().endswith("</html>")
+
+
+class TestExceptionDetailPage:
+    """Tests for the exception detail page."""
+
+    def test_context_follows_the_record_across_stores(self):
+        # Both stores number their first exception 1
+        pages = []
+        for user in ("alice", "bob"):
+            store = InMemoryStore()
+            store.insert_exception(make_exception(1, ctx={"user": user}))
+            pages.append(str(html(exception_detail_page(store.get_exception(1)))))
+
+        assert "alice" in pages[0] and "bob" not in pages[0]
+        assert "bob" in pages[1] and "alice" not in pages[1]
+
+    def test_context_dump_is_kept_on_the_record(self):
+        store = InMemoryStore()
+        store.insert_exception(make_exception(1, ctx={"user": "alice"}))
+        exc = store.get_exception(1)
+        assert exc.ctx_json is None
+
+        str(html(exception_detail_page(exc)))
+
+        assert exc.ctx_json == '{\n  "user": "alice"\n}'
+
+
+class TestTracePaging:
+    """Tests for keyset paging of traces, newest first."""
+
+    def test_first_page_is_newest(self, store: InMemoryStore):
+        page, prev, nxt = store.get_traces(per_page=2)
+
+        assert ids(page) == ids([make_trace(5), make_trace(4)])
+        assert prev is None
+        assert nxt == page[-1].trace_id
+
+    def test_pages_forward(self, store: InMemoryStore):
+        seen, after = [], None
+        while True:
+            page, _, after = store.get_traces(after=after, per_page=2)
+            seen.append(ids(page))
+            if after is None:
+                break
+
+        assert seen == [
+            ids([make_trace(5), make_trace(4)]),
+            ids([make_trace(3), make_trace(2)]),
+            ids([make_trace(1)]),
+        ]
+
+    def test_pages_backward(self, store: InMemoryStore):
+        _, _, nxt = store.get_traces(per_page=2)
+        _, _, nxt = store.get_traces(after=nxt, per_page=2)
+        last, prev, nxt = store.get_traces(after=nxt, per_page=2)
+        assert ids(last) == ids([make_trace(1)])
+        assert nxt is None
+
+        page, prev, nxt = store.get_traces(before=prev, per_page=2)
+        assert ids(page) == ids([make_trace(3), make_trace(2)])
+        assert nxt == page[-1].trace_id
+
+        page, prev, _ = store.get_traces(before=prev, per_page=2)
+        assert ids(page) == ids([make_trace(5), make_trace(4)])
+        assert prev is None
+
+    def test_short_page_before_falls_back_to_first_page(self, store: InMemoryStore):
+        # Only trace 5 is newer than 4, too few for a page of two
+        page, prev, _ = store.get_traces(before=make_trace(4).trace_id, per_page=2)
+
+        assert ids(page) == ids([make_trace(5), make_trace(4)])
+        assert prev is None
+
+    def test_unknown_cursor_falls_back_to_first_page(self, store: InMemoryStore):
+        assert store.get_traces(after="missing", per_page=2) == store.get_traces(per_page=2)
+        assert store.get_traces(before="missing", per_page=2) == store.get_traces(per_page=2)
+
+    def test_status_filter(self, store: InMemoryStore):
+        page, prev, nxt = store.get_traces(per_page=1, status="ERROR")
+        assert ids(page) == ids([make_trace(4)])
+        assert prev is None
+
+        page, prev, nxt = store.get_traces(after=nxt, per_page=1, status="ERROR")
+        assert ids(page) == ids([make_trace(2)])
+        assert prev == page[0].trace_id
+        assert nxt is None
+
+    def test_empty_store(self):
+        assert InMemoryStore().get_traces() == ([], None, None)
+
+    def test_reexported_trace_moves_to_its_new_start(self, store: InMemoryStore):
+        # Trace 1 is exported again with a later start and a new status
+        moved = make_trace(1, status="ERROR")
+        moved.started_at = START + timedelta(seconds=10)
+        store.insert_trace(moved)
+
+        page, _, _ = store.get_traces(per_page=10)
+        assert ids(page) == ids([moved, make_trace(5), make_trace(4), make_trace(3), make_trace(2)])
+        assert page[0] is moved
+        errors, _, _ = store.get_traces(per_page=10, status="ERROR")
+        assert moved.trace_id in ids(errors)
+
+
+class TestExceptionPaging:
+    """Tests for keyset paging of exceptions, newest first."""
+
+    @pytest.fixture
+    def store(self) -> InMemoryStore:
+        store = InMemoryStore()
+        for n in (2, 5, 1, 4, 3):
+            store.insert_exception(make_exception(n))
+        return store
+
+    def test_first_page_is_newest(self, store: InMemoryStore):
+        page, prev, nxt = store.get_exceptions(per_page=2)
+
+        assert [e.fingerprint for e in page] == ["fp5", "fp4"]
+        assert prev is None
+        assert nxt == page[-1].id
+
+    def test_pages_forward_and_back(self, store: InMemoryStore):
+        _, _, nxt = store.get_exceptions(per_page=2)
+        page, prev, nxt = store.get_exceptions(after=nxt, per_page=2)
+        assert [e.fingerprint for e in page] == ["fp3", "fp2"]
+        assert prev == page[0].id
+
+        last, prev, nxt = store.get_exceptions(after=nxt, per_page=2)
+        assert [e.fingerprint for e in last] == ["fp1"]
+        assert nxt is None
+
+        page, prev, _ = store.get_exceptions(before=prev, per_page=2)
+        assert [e.fingerprint for e in page] == ["fp3", "fp2"]
+
+    def test_everything_fits_on_first_page(self, store: InMemoryStore):
+        page, prev, nxt = store.get_exceptions(per_page=5)
+
+        assert len(page) == 5
+        assert prev is None and nxt is None
+
+    def test_unknown_cursor_falls_back_to_first_page(self, store: InMemoryStore):
+        first = store.get_exceptions(per_page=2)
+
+        assert store.get_exceptions(after=99, per_page=2) == first
+        assert store.get_exceptions(before=99, per_page=2) == first
+
+    def test_empty_store(self):
+        assert InMemoryStore().get_exceptions() == ([], None, None)
+
+
+class TestDashboardStats:
+    """Tests for the running dashboard figures and their snapshot."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch: pytest.MonkeyPatch) -> list[float]:
+        """Settable time.monotonic, starting at 1000."""
+        now = [1000.0]
+        monkeypatch.setattr("time.monotonic", lambda: now[0])
+        return now
+
+    def test_counts_errors_and_duration(self):
+        store = InMemoryStore()
+        store.insert_trace(make_trace(1, duration_ms=10))
+        store.insert_traces([make_trace(2, "ERROR", 20), make_trace(3, duration_ms=60)])
+
+        stats = store.get_dashboard_stats()
+        assert stats.trace_count == 3
+        assert stats.error_count == 1
+        assert stats.error_rate_str == "33.3%"
+        assert stats.avg_duration_ms_str == "30ms"
+
+    def test_reexport_replaces_previous_figures(self):
+        store = InMemoryStore()
+        store.insert_traces([make_trace(1, "ERROR", 100), make_trace(2, duration_ms=20)])
+        store.insert_trace(make_trace(1, duration_ms=40))
+
+        stats = store.get_dashboard_stats()
+        assert stats.trace_count == 2
+        assert stats.error_count == 0
+        assert stats.avg_duration_ms == 30
+
+    def test_empty_store(self):
+        stats = InMemoryStore().get_dashboard_stats()
+
+        assert stats.trace_count == 0
+        assert stats.error_rate == 0
+        assert stats.avg_duration_ms == 0
+        assert stats.recent_traces == []
+
+    def test_recent_traces_match_first_traces_page(self, store: InMemoryStore):
+        stats = store.get_dashboard_stats()
+        first_page, _, _ = store.get_traces(per_page=RECENT_LIMIT)
+
+        assert ids(stats.recent_traces) == ids(first_page)
+        assert ids(stats.recent_traces) == ids([make_trace(n) for n in (5, 4, 3, 2, 1)])
+
+    def test_recent_traces_are_capped(self):
+        store = InMemoryStore()
+        store.insert_traces([make_trace(n) for n in range(RECENT_LIMIT + 5)])
+
+        recent = store.get_dashboard_stats().recent_traces
+        assert len(recent) == RECENT_LIMIT
+        assert recent[0].trace_id == make_trace(RECENT_LIMIT + 4).trace_id
+
+    def test_recent_exceptions_newest_first(self):
+        store = InMemoryStore()
+        for n in range(1, 4):
+            store.insert_exception(make_exception(n))
+
+        recent = store.get_dashboard_stats().recent_exceptions
+        assert [e.fingerprint for e in recent] == ["fp3", "fp2", "fp1"]
+
+    def test_snapshot_reused_while_unchanged(self, store: InMemoryStore, clock: list[float]):
+        stats = store.get_dashboard_stats()
+        clock[0] += DASHBOARD_STATS_TTL * 10
+
+        assert store.get_dashboard_stats() is stats
+
+    def test_snapshot_reused_within_ttl(self, store: InMemoryStore, clock: list[float]):
+        stats = store.get_dashboard_stats()
+        store.insert_trace(make_trace(6))
+        clock[0] += DASHBOARD_STATS_TTL / 2
+
+        assert store.get_dashboard_stats() is stats
+
+    def test_snapshot_rebuilt_after_ttl(self, store: InMemoryStore, clock: list[float]):
+        stats = store.get_dashboard_stats()
+        store.insert_trace(make_trace(6))
+        clock[0] += DASHBOARD_STATS_TTL
+
+        fresh = store.get_dashboard_stats()
+        assert fresh is not stats
+        assert fresh.trace_count == stats.trace_count + 1
+        assert fresh.recent_traces[0].trace_id == make_trace(6).trace_id
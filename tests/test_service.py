@@ -0,0 +1,72 @@
+"""Tests for the htmpl admin extension."""
+
+import pytest
+from pathlib import Path
+
+from rendered.services.htmpl_admin import service
+from rendered.services.htmpl_admin.service import HTMPLAdmin
+from rendered.settings import AppSettings
+
+TTL = """\
+@prefix htmpl: <htmpl://> .
+@prefix dep: <htmpl://depends/> .
+
+<htmpl://components/auth> htmpl:name "auth" .
+<htmpl://components/auth> htmpl:configKey "auth" .
+<htmpl://components/auth> dep:requires <htmpl://services/redis> .
+
+<htmpl://services/redis> htmpl:name "redis" .
+"""
+
+
+@pytest.fixture
+def ttl_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Stand-in for the bundled components.ttl, so tests can edit it."""
+    ttl_dir = tmp_path / "bundled"
+    ttl_dir.mkdir()
+    (ttl_dir / "components.ttl").write_text(TTL)
+    monkeypatch.setattr(service, "CURRENT_DIR", ttl_dir)
+    return ttl_dir
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path) -> Path:
+    project = tmp_path / "project"
+    project.mkdir()
+    return project
+
+
+@pytest.fixture
+def admin(ttl_dir: Path, project_dir: Path) -> HTMPLAdmin:
+    return HTMPLAdmin(AppSettings(project_dir=project_dir))
+
+
+class TestGraphFactory:
+    """Tests for the shared ComponentGraph handed to requests."""
+
+    async def test_loads_ttl(self, admin: HTMPLAdmin):
+        graph = await admin._graph_factory(None)  # type: ignore[arg-type]
+
+        assert graph.get_deps("components/auth") == {"services/redis"}
+
+    async def test_unchanged_ttl_reuses_graph(self, admin: HTMPLAdmin):
+        graph = await admin._graph_factory(None)  # type: ignore[arg-type]
+
+        assert await admin._graph_factory(None) is graph  # type: ignore[arg-type]
+
+    async def test_changed_ttl_rebuilds_graph(self, admin: HTMPLAdmin, ttl_dir: Path):
+        graph = await admin._graph_factory(None)  # type: ignore[arg-type]
+        (ttl_dir / "components.ttl").write_text(
+            TTL + '<htmpl://services/cache> htmpl:name "cache" .\n'
+        )
+
+        rebuilt = await admin._graph_factory(None)  # type: ignore[arg-type]
+        assert rebuilt is not graph
+        assert rebuilt.get_component("services/cache") is not None
+
+    async def test_reused_graph_sees_new_installs(self, admin: HTMPLAdmin, project_dir: Path):
+        graph = await admin._graph_factory(None)  # type: ignore[arg-type]
+        (project_dir / "services" / "redis").mkdir(parents=True)
+
+        assert await admin._graph_factory(None) is graph  # type: ignore[arg-type]
+        assert graph.get_installed() == {"services/redis"}